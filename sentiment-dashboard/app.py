@@ -93,15 +93,14 @@ if not st.session_state.app_loaded:
 import streamlit as st
 import pandas as pd
 import json
-import tempfile
 from utils import (
     analyze_sentiment,
     extract_keywords,
     export_to_pdf,
-    get_download_link,
     explain_sentiment,
     handle_followup_question,
     validate_text_input,
+    valid_text_mask,
     validate_file_content,
     safe_sentiment_analysis,
     safe_keyword_extraction,
@@ -123,11 +122,16 @@ from visualizations import (
     create_sentiment_distribution, 
     create_confidence_chart, 
     create_keyword_importance,
-    generate_wordcloud
+    generate_wordcloud,
+    get_sentiment_counts,
+    resolve_theme
 )
 from datetime import datetime
 import plotly.express as px
 
+# Resolve the chart theme once per rerun; chart builders read it from session state
+st.session_state['_theme'] = resolve_theme()
+
 # Initialize models with caching
 @st.cache_resource
 def initialize_models():
@@ -148,11 +152,51 @@ def cached_keyword_extraction(text: str):
     """Cache keyword extraction results."""
     return extract_keywords(text)
 
+class _UncachedBatchResult(Exception):
+    """Carries a batch result out of the cache without storing it (some batches failed)."""
+    def __init__(self, results_df: pd.DataFrame):
+        super().__init__("batch result contains failed batches")
+        self.results_df = results_df
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_batch_processing(texts: list, fast_path: bool = False):
+    results_df = BatchProcessor.process_batch(texts, fast_path=fast_path)
+    # st.cache_data does not store results of calls that raise
+    if 'sentiment' in results_df.columns and (results_df['sentiment'] == 'Batch Failed').any():
+        raise _UncachedBatchResult(results_df)
+    return results_df
+
+def cached_batch_processing(texts: list, fast_path: bool = False):
+    """Cache batch processing results so reruns with the same texts skip inference.
+    Runs with failed batches are returned but not cached, so a retry re-runs them."""
+    try:
+        return _cached_batch_processing(texts, fast_path)
+    except _UncachedBatchResult as uncached:
+        return uncached.results_df
+
 @st.cache_data(ttl=3600)
 def cached_visualization(data: pd.DataFrame, viz_type: str, **kwargs):
     """Cache visualization results."""
     return VisualizationOptimizer.create_visualization(data, viz_type, **kwargs)
 
+def session_sentiment_chart(data: pd.DataFrame, plot_type: str, key: str):
+    """
+    Sentiment distribution figure reused from session state across reruns.
+    
+    The figure is only rebuilt when the chart type or the sentiment counts change,
+    so toggling unrelated widgets skips both the rebuild and the cache round trip.
+    Display only: the returned figure is shared and must not be mutated.
+    """
+    state_key = f"_last_fig_{key}"
+    signature = (plot_type, tuple(get_sentiment_counts(data).items()))
+    cached = st.session_state.get(state_key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    fig = cached_visualization(data, "sentiment_distribution", plot_type=plot_type)
+    st.session_state[state_key] = (signature, fig)
+    return fig
+
 # Page configuration already set at the top of the file
 
 # Adaptive CSS for Light & Dark Modes
@@ -992,10 +1036,17 @@ with tab2:
                                        value=True, 
                                        help="Enable optimized processing for deployment environments")
     
+    lexicon_fast_path = False
     if force_optimization:
         st.info("🚀 Optimized processing enabled - works for any amount of text")
     else:
         st.warning("⚠️ Standard processing - may hang on large datasets in deployment")
+        lexicon_fast_path = st.toggle(
+            "Lexicon Fast Path",
+            value=False,
+            help="Label clearly positive/negative texts with the VADER lexicon instead of the model. "
+                 "Faster, but those rows are only Positive/Negative and have no model confidence."
+        )
     
     # File upload with enhanced error handling
     uploaded_file = st.file_uploader(
@@ -1015,15 +1066,11 @@ with tab2:
             # Enhanced batch processing with better error handling
             try:
                 # Validate texts before processing
-                valid_texts = []
-                invalid_count = 0
-                
                 with st.spinner("🔍 Validating texts..."):
-                    for text in first_col.tolist():
-                        if validate_text_input(str(text)) is None:
-                            valid_texts.append(text)
-                        else:
-                            invalid_count += 1
+                    # One vectorized pass over the column instead of validating row by row
+                    valid_mask = valid_text_mask(first_col)
+                    valid_texts = first_col[valid_mask].tolist()
+                    invalid_count = int((~valid_mask).sum())
                 
                 # Show validation results
                 if invalid_count > 0:
@@ -1049,7 +1096,7 @@ with tab2:
                             else:
                                 # Use standard processing (may hang in deployment)
                                 st.warning("⚠️ Using standard processing - this may hang in deployment environments")
-                                results_df = BatchProcessor.process_batch(valid_texts)
+                                results_df = cached_batch_processing(valid_texts, fast_path=lexicon_fast_path)
                             
                         except Exception as batch_error:
                             st.error(f"❌ Processing failed: {str(batch_error)}")
@@ -1127,18 +1174,14 @@ with tab2:
                     
                     with results_tab1:
                         st.subheader("Analysis Results")
-                        # Add original text column for display
-                        display_df = results_df.copy()
-                        display_df['original_text'] = first_col.values[:len(results_df)]
+                        # Add original text column for display, truncating only the rows shown
+                        original_text = first_col.iloc[:len(results_df)].astype(str).str[:100] + "..."
                         
-                        # Reorder columns for better display
-                        if 'original_text' in display_df.columns:
-                            cols = ['original_text', 'sentiment', 'confidence', 'use_case']
-                            display_cols = [col for col in cols if col in display_df.columns]
-                            display_df = display_df[display_cols]
-                            
-                            # Truncate long text for display
-                            display_df['original_text'] = display_df['original_text'].astype(str).str[:100] + "..."
+                        # Select just the displayed columns instead of copying the whole results frame
+                        cols = ['sentiment', 'confidence', 'use_case']
+                        display_cols = [col for col in cols if col in results_df.columns]
+                        display_df = results_df[display_cols].assign(original_text=original_text.to_numpy())
+                        display_df = display_df[['original_text'] + display_cols]
                         
                         st.dataframe(display_df, use_container_width=True, hide_index=True)
                         
@@ -1172,9 +1215,10 @@ with tab2:
                         
                         # Create and display the selected chart
                         try:
-                            fig = cached_visualization(results_df, "sentiment_distribution", plot_type=chart_type)
+                            fig = session_sentiment_chart(results_df, chart_type, key="batch")
                             if fig is not None:
-                                st.plotly_chart(fig, use_container_width=True)
+                                # A stable key lets the browser update the existing chart in place
+                                st.plotly_chart(fig, use_container_width=True, key="batch_sentiment_chart")
                             else:
                                 st.warning("Could not generate visualization. Please try a different chart type.")
                         except Exception as e:
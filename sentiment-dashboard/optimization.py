@@ -1,10 +1,16 @@
+import atexit
 import functools
+import hashlib
 import time
+from collections import OrderedDict
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
+import torch
 from transformers import pipeline
 from keybert import KeyBERT
+from sentence_transformers import SentenceTransformer
+from sklearn.feature_extraction.text import CountVectorizer
 import streamlit as st
 from visualizations import (
     create_sentiment_distribution,
@@ -13,6 +19,54 @@ from visualizations import (
 import threading
 import signal
 import os
+import platform
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    VADER_AVAILABLE = True
+except ImportError:
+    VADER_AVAILABLE = False
+
+SENTIMENT_MODEL_ID = "nlptown/bert-base-multilingual-uncased-sentiment"
+KEYWORD_MODEL_ID = "all-MiniLM-L6-v2"
+MODEL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sentiment-dashboard")
+INFERENCE_BATCH_SIZE = 32
+MAX_TOKEN_LENGTH = 512
+NUM_SENTIMENT_CLASSES = 5
+PARALLEL_CHUNK_SIZE = 256
+PROCESS_POOL_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+# Concurrent ONNX Runtime forward passes for in-process chunks; each session is capped at
+# _INTRA_OP_THREADS so the passes together match the cores. Torch runs one pass at a time.
+INFERENCE_THREADS = max(1, min(4, (os.cpu_count() or 2) // 2))
+# Intra-op threads per ONNX Runtime session; pool workers lower it in _init_worker
+_INTRA_OP_THREADS = max(1, (os.cpu_count() or 2) // INFERENCE_THREADS)
+FAST_PATH_THRESHOLD = 0.8  # |VADER compound| above which the lexicon label is accepted
+
+# List inputs to the sentiment pipeline run in mini-batches; over-long texts are truncated
+SENTIMENT_PIPELINE_KWARGS = {"batch_size": INFERENCE_BATCH_SIZE, "truncation": True}
+
+# Sentiment labels in display order, indexed by label code
+SENTIMENT_LABELS = np.array([
+    'Very Positive',
+    'Positive',
+    'Neutral',
+    'Negative',
+    'Very Negative',
+    'Batch Failed'
+])
+
+# Ordered categorical dtype for the sentiment column; codes line up with SENTIMENT_LABELS
+SENTIMENT_DTYPE = pd.CategoricalDtype(categories=SENTIMENT_LABELS.tolist(), ordered=True)
+
+# Label code per raw 1-5 star score; score 0 marks a failed batch
+_SCORE_TO_CODE = np.array([5, 4, 3, 2, 1, 0], dtype=np.int8)
+
+def _score_to_label_code(raw_scores):
+    """Map raw star scores to label codes with a table lookup."""
+    return _SCORE_TO_CODE[raw_scores]
 
 # Import the determine_use_case function from utils
 def determine_use_case(text):
@@ -56,6 +110,7 @@ def determine_use_case(text):
 # Cache configuration
 CACHE_TTL = 3600  # 1 hour cache time
 MAX_CACHE_SIZE = 1000  # Maximum number of cached items
+EMBEDDING_CACHE_SIZE = 4096  # Document embeddings kept per process for keyword extraction
 
 def timed_cache(ttl: int = CACHE_TTL, max_size: int = MAX_CACHE_SIZE):
     """
@@ -66,7 +121,8 @@ def timed_cache(ttl: int = CACHE_TTL, max_size: int = MAX_CACHE_SIZE):
         max_size: Maximum number of items to keep in cache
     """
     def decorator(func: Callable) -> Callable:
-        cache: Dict[str, Tuple[Any, float]] = {}
+        # Insertion order doubles as timestamp order, so the oldest entry is always first
+        cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
         
         @functools.wraps(func)
         def wrapper(*args, **kwargs) -> Any:
@@ -85,13 +141,13 @@ def timed_cache(ttl: int = CACHE_TTL, max_size: int = MAX_CACHE_SIZE):
             execution_time = time.time() - start_time
             
             # Manage cache size
-            if len(cache) >= max_size:
+            if key not in cache and len(cache) >= max_size:
                 # Remove oldest entry
-                oldest_key = min(cache.keys(), key=lambda k: cache[k][1])
-                del cache[oldest_key]
+                cache.popitem(last=False)
             
             # Store result with timestamp
             cache[key] = (result, time.time())
+            cache.move_to_end(key)
             
             return result
         
@@ -124,11 +180,15 @@ class ModelManager:
                     if 'streamlit' in globals():
                         st.info("🔄 Loading sentiment analysis model (first time may take 1-2 minutes)...")
                     
-                    cls._models[model_name] = pipeline(
-                        "sentiment-analysis",
-                        model="nlptown/bert-base-multilingual-uncased-sentiment",
-                        tokenizer="nlptown/bert-base-multilingual-uncased-sentiment"
-                    )
+                    try:
+                        cls._models[model_name] = cls._load_quantized_sentiment_pipeline()
+                    except ImportError:
+                        # optimum/onnxruntime not installed - fall back to the PyTorch model
+                        cls._models[model_name] = cls._load_torch_sentiment_pipeline()
+                    except Exception as ort_error:
+                        # Export, quantization or session creation failed - the PyTorch model still works
+                        print(f"Quantized ONNX sentiment model unavailable, using PyTorch: {str(ort_error)}")
+                        cls._models[model_name] = cls._load_torch_sentiment_pipeline()
                     
                     if 'streamlit' in globals():
                         st.success("✅ Sentiment model loaded successfully!")
@@ -137,10 +197,14 @@ class ModelManager:
                     if 'streamlit' in globals():
                         st.info("🔄 Loading keyword extraction model...")
                     
-                    cls._models[model_name] = KeyBERT()
+                    # One SentenceTransformer per process, shared by every keyword extraction
+                    cls._models[model_name] = KeyBERT(model=SentenceTransformer(KEYWORD_MODEL_ID))
                     
                     if 'streamlit' in globals():
                         st.success("✅ Keyword model loaded successfully!")
+                
+                elif model_name == "lexicon":
+                    cls._models[model_name] = SentimentIntensityAnalyzer()
                         
             except Exception as e:
                 if 'streamlit' in globals():
@@ -148,6 +212,365 @@ class ModelManager:
                 raise e
                 
         return cls._models[model_name]
+    
+    @classmethod
+    def get_raw(cls, model_name: str):
+        """
+        Get the (tokenizer, model) pair behind a loaded pipeline for direct batched inference.
+        
+        Args:
+            model_name: Name of the pipeline model to unwrap
+        """
+        model_pipeline = cls.get_model(model_name)
+        return model_pipeline.tokenizer, model_pipeline.model
+    
+    @staticmethod
+    def _load_torch_sentiment_pipeline():
+        """
+        Load the PyTorch sentiment pipeline, in float16 on the first GPU if one is present.
+        
+        When optimum is available the model is converted with BetterTransformer,
+        which swaps in PyTorch's fused attention kernels and skips compute on
+        padding tokens.
+        """
+        # Half precision on GPU halves weight and activation bandwidth; CPU stays float32
+        gpu_kwargs = {"device": 0, "torch_dtype": torch.float16} if torch.cuda.is_available() else {}
+        sentiment_pipeline = pipeline(
+            "sentiment-analysis",
+            model=SENTIMENT_MODEL_ID,
+            tokenizer=SENTIMENT_MODEL_ID,
+            use_fast=True,
+            **SENTIMENT_PIPELINE_KWARGS,
+            **gpu_kwargs
+        )
+        
+        try:
+            from optimum.bettertransformer import BetterTransformer
+            sentiment_pipeline.model = BetterTransformer.transform(
+                sentiment_pipeline.model,
+                keep_original_model=False
+            )
+        except (ImportError, NotImplementedError, ValueError):
+            # Optimum missing or architecture unsupported - keep the stock model
+            pass
+        
+        sentiment_pipeline.model.eval()
+        return sentiment_pipeline
+    
+    @staticmethod
+    def _load_quantized_sentiment_pipeline():
+        """
+        Load the sentiment model as a dynamically INT8-quantized ONNX Runtime graph.
+        
+        The export and quantization only run once; the resulting .onnx file is
+        cached under MODEL_CACHE_DIR and reused on subsequent starts.
+        """
+        from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+        from optimum.pipelines import pipeline as ort_pipeline
+        from transformers import AutoTokenizer
+        import onnxruntime
+        
+        # ARM CPUs get the arm64 kernels' quantization scheme; x86 targets VNNI int8 GEMM
+        target = "arm64" if platform.machine().lower() in ("arm64", "aarch64") else "avx512_vnni"
+        quantized_dir = os.path.join(MODEL_CACHE_DIR, f"sentiment-onnx-int8-{target}")
+        quantized_file = "model_quantized.onnx"
+        
+        if not os.path.exists(os.path.join(quantized_dir, quantized_file)):
+            onnx_model = ORTModelForSequenceClassification.from_pretrained(SENTIMENT_MODEL_ID, export=True)
+            quantizer = ORTQuantizer.from_pretrained(onnx_model)
+            quantizer.quantize(
+                save_dir=quantized_dir,
+                quantization_config=getattr(AutoQuantizationConfig, target)(is_static=False, per_channel=False)
+            )
+            onnx_model.config.save_pretrained(quantized_dir)
+            AutoTokenizer.from_pretrained(SENTIMENT_MODEL_ID, use_fast=True).save_pretrained(quantized_dir)
+        
+        # Without explicit options every session would spin up one thread per core
+        session_options = onnxruntime.SessionOptions()
+        session_options.intra_op_num_threads = _INTRA_OP_THREADS
+        model = ORTModelForSequenceClassification.from_pretrained(
+            quantized_dir,
+            file_name=quantized_file,
+            session_options=session_options
+        )
+        tokenizer = AutoTokenizer.from_pretrained(quantized_dir, use_fast=True)
+        return ort_pipeline(
+            "sentiment-analysis",
+            model=model,
+            tokenizer=tokenizer,
+            accelerator="ort",
+            **SENTIMENT_PIPELINE_KWARGS
+        )
+
+def _length_sorted_batches(
+    texts: List[str],
+    batch_size: int = INFERENCE_BATCH_SIZE
+) -> List[Tuple[np.ndarray, Dict[str, torch.Tensor]]]:
+    """
+    Tokenize texts once and cut them into padded batches in token-length order.
+    
+    All texts are tokenized together (truncated to the model limit) and sorted
+    by token length before batching, so each batch is only padded to the
+    length of its own longest text instead of mixing short and long texts.
+    
+    Args:
+        texts: List of texts to score
+        batch_size: Number of texts per forward pass
+    
+    Returns:
+        (positions, padded batch) pairs; positions index into texts and are
+        used to scatter each batch's scores back to input order
+    """
+    tokenizer, _ = ModelManager.get_raw("sentiment")
+    encoded = tokenizer(texts, truncation=True, max_length=MAX_TOKEN_LENGTH)
+    lengths = np.fromiter((len(ids) for ids in encoded['input_ids']), dtype=np.int64, count=len(texts))
+    order = np.argsort(lengths, kind='stable')
+    
+    batches = []
+    for start in range(0, len(texts), batch_size):
+        batch_order = order[start:start + batch_size]
+        features = [{key: encoded[key][j] for key in encoded.keys()} for j in batch_order]
+        batches.append((batch_order, tokenizer.pad(features, padding='longest', return_tensors="pt")))
+    return batches
+
+def _batch_infer(batch: Dict[str, torch.Tensor]) -> np.ndarray:
+    """
+    Run the sentiment model on one padded batch.
+    
+    Returns:
+        Array of shape (batch size, 5) with the 1-5 star class probabilities
+    """
+    _, model = ModelManager.get_raw("sentiment")
+    with torch.inference_mode():
+        batch = {key: value.to(model.device) for key, value in batch.items()}
+        return model(**batch).logits.softmax(-1).float().cpu().numpy()
+
+# Normalized keyword-model document embeddings keyed by text digest, least recently used first
+_EMBEDDING_CACHE: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+_EMBEDDING_CACHE_LOCK = threading.Lock()
+
+def _embed_documents(keyword_model, texts: List[str]) -> np.ndarray:
+    """
+    L2-normalized keyword-model embeddings for texts, reusing ones seen before.
+    
+    Only texts missing from the per-process cache are sent through the
+    embedding model, in a single call; re-running a batch or overlapping
+    uploads skips re-embedding the documents already analyzed.
+    """
+    keys = [hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest() for text in texts]
+    with _EMBEDDING_CACHE_LOCK:
+        embeddings = [_EMBEDDING_CACHE.get(key) for key in keys]
+    
+    # Embed outside the lock so other sessions are not blocked on the model
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+    if missing:
+        fresh = np.asarray(keyword_model.model.embed([texts[i] for i in missing]), dtype=np.float32)
+        fresh /= np.linalg.norm(fresh, axis=1, keepdims=True) + 1e-12
+        for i, embedding in zip(missing, fresh):
+            embeddings[i] = embedding
+    
+    with _EMBEDDING_CACHE_LOCK:
+        for key, embedding in zip(keys, embeddings):
+            _EMBEDDING_CACHE[key] = embedding
+            _EMBEDDING_CACHE.move_to_end(key)
+        while len(_EMBEDDING_CACHE) > EMBEDDING_CACHE_SIZE:
+            _EMBEDDING_CACHE.popitem(last=False)
+    return np.stack(embeddings)
+
+def _extract_keyword_str(keyword_model, text: str, position: int) -> str:
+    """Extract the top keywords for one text as a comma-separated string."""
+    try:
+        keywords = keyword_model.extract_keywords(
+            text,
+            keyphrase_ngram_range=(1, 2),
+            stop_words='english',
+            top_n=3  # Reduced for performance
+        )
+        return ', '.join([k[0] for k in keywords])
+    except Exception as keyword_error:
+        if 'streamlit' in globals():
+            st.warning(f"⚠️ Keyword extraction failed for text {position}: {str(keyword_error)}")
+        return "keyword extraction failed"
+
+def _extract_keywords_batch(
+    keyword_model,
+    texts: List[str],
+    positions: List[int],
+    top_n: int = 3
+) -> List[str]:
+    """
+    Extract the top keywords for many texts against one shared candidate vocabulary.
+    
+    A single CountVectorizer collects candidate phrases across the whole batch and
+    the union of candidates is embedded once, so phrases shared between texts are
+    only encoded a single time. Document embeddings come from a per-process cache. Each text is then ranked by cosine similarity
+    against its own candidates only, matching KeyBERT's per-text results.
+    
+    Args:
+        keyword_model: Loaded KeyBERT model
+        texts: Texts to extract keywords from
+        positions: 1-based position of each text in the full batch, for warnings
+        top_n: Number of keywords per text
+    """
+    if not texts:
+        return []
+    
+    try:
+        vectorizer = CountVectorizer(ngram_range=(1, 2), stop_words='english')
+        doc_terms = vectorizer.fit_transform(texts).tocsr()
+        candidates = vectorizer.get_feature_names_out()
+        
+        candidate_embeddings = np.asarray(keyword_model.model.embed(list(candidates)), dtype=np.float32)
+        candidate_embeddings /= np.linalg.norm(candidate_embeddings, axis=1, keepdims=True) + 1e-12
+        doc_embeddings = _embed_documents(keyword_model, texts)
+    except Exception:
+        # Empty vocabulary or embedding failure: fall back to per-text extraction
+        return [
+            _extract_keyword_str(keyword_model, text, position)
+            for text, position in zip(texts, positions)
+        ]
+    
+    keywords = []
+    for i in range(len(texts)):
+        own = doc_terms.indices[doc_terms.indptr[i]:doc_terms.indptr[i + 1]]
+        if own.size == 0:
+            keywords.append('')
+            continue
+        similarities = candidate_embeddings[own] @ doc_embeddings[i]
+        k = min(top_n, own.size)
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        keywords.append(', '.join(candidates[own[top]]))
+    return keywords
+
+def _init_worker(num_threads: int):
+    """Limit intra-op threads so parallel workers do not oversubscribe the CPU."""
+    global _INTRA_OP_THREADS
+    # Runs before the worker loads any model, so its ONNX Runtime session picks this up too
+    _INTRA_OP_THREADS = num_threads
+    torch.set_num_threads(num_threads)
+
+# Worker processes keep their loaded models between batches, so the pool lives for the whole app
+_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_PROCESS_POOL_LOCK = threading.Lock()
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Shared chunk-processing pool, created on first use and shut down at exit."""
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            # Spawn rather than fork: forking after torch has started its thread pools can deadlock
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=PROCESS_POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(max(1, (os.cpu_count() or 2) // PROCESS_POOL_WORKERS),)
+            )
+        return _PROCESS_POOL
+
+def _discard_process_pool():
+    """Drop the shared pool (after a worker died, or at exit); the next batch starts a new one."""
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        pool, _PROCESS_POOL = _PROCESS_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+atexit.register(_discard_process_pool)
+
+def _process_chunk(
+    texts: List[str],
+    offset: int = 0,
+    batch_size: int = INFERENCE_BATCH_SIZE,
+    fast_path: bool = False,
+    threads: int = 1
+) -> pd.DataFrame:
+    """
+    Score, label and annotate one chunk of texts.
+    
+    Runs either in the calling process or in a worker process; models are
+    loaded lazily through ModelManager the first time each process needs them.
+    
+    Args:
+        texts: Chunk of non-empty texts
+        offset: Position of the chunk's first text in the full batch
+        batch_size: Number of texts per forward pass
+        fast_path: Accept confident VADER lexicon labels (Positive/Negative,
+            NaN confidence, compound score in lexicon_score) and only send the
+            remaining texts through the transformer model
+        threads: Number of batches to run through the model concurrently
+    """
+    keyword_model = ModelManager.get_model("keyword")
+    
+    # Cheap lexicon pass first: clearly positive/negative texts skip the model
+    compound = np.zeros(len(texts), dtype=np.float32)
+    if fast_path and VADER_AVAILABLE:
+        lexicon = ModelManager.get_model("lexicon")
+        compound = np.fromiter(
+            (lexicon.polarity_scores(text)['compound'] for text in texts),
+            dtype=np.float32,
+            count=len(texts)
+        )
+    confident = np.abs(compound) > FAST_PATH_THRESHOLD
+    uncertain = np.flatnonzero(~confident)
+    uncertain_texts = [texts[i] for i in uncertain]
+    
+    # Class probabilities per text; rows of a failed batch stay NaN
+    scores = np.full((len(texts), NUM_SENTIMENT_CLASSES), np.nan, dtype=np.float32)
+    
+    # Tokenize and length-sort the whole chunk up front; only forward passes go to the pool
+    try:
+        batches = _length_sorted_batches(uncertain_texts, batch_size) if uncertain_texts else []
+    except Exception as tokenize_error:
+        batches = []
+        if 'streamlit' in globals():
+            st.error(f"❌ Tokenization failed for chunk starting at text {offset + 1}: {str(tokenize_error)}")
+    
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+        futures = [executor.submit(_batch_infer, batch) for _, batch in batches]
+    
+    for (batch_order, _), future in zip(batches, futures):
+        try:
+            # Scatter the length-sorted batch back to its rows in the chunk
+            scores[uncertain[batch_order]] = future.result()
+        except Exception as batch_error:
+            if 'streamlit' in globals():
+                st.error(f"❌ Batch containing text {offset + uncertain[batch_order[0]] + 1} failed: {str(batch_error)}")
+    
+    # Vectorized score -> label mapping (raw score 0 marks a failed batch)
+    failed = ~confident & np.isnan(scores).any(axis=1)
+    filled_scores = np.nan_to_num(scores)
+    raw_scores = np.where(failed, 0, filled_scores.argmax(axis=1) + 1)
+    confidences = np.where(failed, 0.0, filled_scores.max(axis=1))
+    
+    # Lexicon-accepted rows are labelled Positive/Negative (4/2 stars) by the sign of the
+    # compound score; they carry no model probability, so their confidence stays NaN
+    raw_scores = np.where(confident, np.where(compound > 0, 4, 2), raw_scores)
+    confidences = np.where(confident, np.nan, confidences).round(3)
+    lexicon_scores = np.where(confident, compound, np.nan).round(3)
+    
+    keywords = np.full(len(texts), 'batch error', dtype=object)
+    succeeded = np.flatnonzero(~failed)
+    keywords[succeeded] = _extract_keywords_batch(
+        keyword_model,
+        [texts[i] for i in succeeded],
+        positions=(offset + succeeded + 1).tolist()
+    )
+    use_cases = [
+        'Error' if failed[i] else determine_use_case(text)
+        for i, text in enumerate(texts)
+    ]
+    
+    return pd.DataFrame({
+        'text': texts,
+        'sentiment': pd.Categorical.from_codes(_score_to_label_code(raw_scores), dtype=SENTIMENT_DTYPE),
+        'confidence': confidences,
+        'lexicon_score': lexicon_scores,
+        'raw_score': raw_scores,
+        'keywords': keywords,
+        'use_case': use_cases
+    })
 
 class BatchProcessor:
     """
@@ -155,125 +578,85 @@ class BatchProcessor:
     """
     
     @staticmethod
-    def process_batch(texts: List[str], batch_size: int = 16) -> pd.DataFrame:
+    def process_batch(
+        texts: List[str],
+        batch_size: int = INFERENCE_BATCH_SIZE,
+        fast_path: bool = False
+    ) -> pd.DataFrame:
         """
         Process a batch of texts efficiently with improved error handling.
         
+        Texts are split into chunks of PARALLEL_CHUNK_SIZE; when there is more
+        than one chunk they are processed in parallel worker processes, each
+        owning its own model instances.
+        
         Args:
             texts: List of texts to process
-            batch_size: Size of processing batches (reduced for stability)
+            batch_size: Number of texts per forward pass
+            fast_path: Opt in to a lexicon pre-classifier for clear-cut texts.
+                Those rows get only Positive/Negative labels, a NaN model
+                confidence and their VADER compound score in lexicon_score,
+                so they can differ from analyze_sentiment on the same text.
+                Off by default: every text runs through the transformer model.
         """
         if not texts:
             return pd.DataFrame()
-            
-        results = []
+        
+        # Vectorized validation: strip once and drop empty entries
+        text_series = pd.Series(texts, dtype=object).astype(str).str.strip()
+        text_series = text_series[text_series.ne('')]
+        if text_series.empty:
+            return pd.DataFrame()
+        
+        # Analyze each distinct text once and fan the rows back out afterwards
+        row_codes, unique_texts = pd.factorize(text_series)
+        texts = unique_texts.tolist()
         
         try:
             # Load models with progress indication
-            sentiment_model = ModelManager.get_model("sentiment")
-            keyword_model = ModelManager.get_model("keyword")
-            
-            # Process in smaller batches to prevent hanging
-            total_batches = (len(texts) + batch_size - 1) // batch_size
-            
-            for batch_idx in range(0, len(texts), batch_size):
-                batch = texts[batch_idx:batch_idx + batch_size]
-                current_batch = batch_idx // batch_size + 1
-                
-                if 'streamlit' in globals():
-                    st.info(f"🔄 Processing batch {current_batch}/{total_batches} ({len(batch)} texts)...")
-                
-                try:
-                    # Sentiment analysis with timeout protection
-                    sentiment_results = sentiment_model(batch)
-                    
-                    # Process each result in the batch
-                    for i, (text, sentiment_result) in enumerate(zip(batch, sentiment_results)):
-                        try:
-                            # Parse sentiment score
-                            score = int(sentiment_result['label'].split()[0])
-                            
-                            # Map scores to five sentiment classes
-                            if score == 1:
-                                sentiment = "Very Negative"
-                            elif score == 2:
-                                sentiment = "Negative"
-                            elif score == 3:
-                                sentiment = "Neutral"
-                            elif score == 4:
-                                sentiment = "Positive"
-                            else:  # score == 5
-                                sentiment = "Very Positive"
-                            
-                            # Extract keywords with error handling
-                            try:
-                                keywords = keyword_model.extract_keywords(
-                                    text,
-                                    keyphrase_ngram_range=(1, 2),
-                                    stop_words='english',
-                                    top_n=3  # Reduced for performance
-                                )
-                                keyword_str = ', '.join([k[0] for k in keywords])
-                            except Exception as keyword_error:
-                                keyword_str = "keyword extraction failed"
-                                if 'streamlit' in globals():
-                                    st.warning(f"⚠️ Keyword extraction failed for text {batch_idx + i + 1}: {str(keyword_error)}")
-                            
-                            # Determine use case
-                            try:
-                                use_case = determine_use_case(text)
-                            except Exception:
-                                use_case = "General Analysis"
-                            
-                            results.append({
-                                'text': text,
-                                'sentiment': sentiment,
-                                'confidence': round(sentiment_result['score'], 3),
-                                'raw_score': score,
-                                'keywords': keyword_str,
-                                'use_case': use_case
-                            })
-                            
-                        except Exception as text_error:
-                            # Handle individual text processing errors
-                            results.append({
-                                'text': text,
-                                'sentiment': 'Analysis Failed',
-                                'confidence': 0.0,
-                                'raw_score': 0,
-                                'keywords': 'error',
-                                'use_case': 'Error'
-                            })
-                            if 'streamlit' in globals():
-                                st.warning(f"⚠️ Failed to process text {batch_idx + i + 1}: {str(text_error)}")
-                                
-                except Exception as batch_error:
-                    # Handle batch processing errors
-                    for text in batch:
-                        results.append({
-                            'text': text,
-                            'sentiment': 'Batch Failed',
-                            'confidence': 0.0,
-                            'raw_score': 0,
-                            'keywords': 'batch error',
-                            'use_case': 'Error'
-                        })
-                    if 'streamlit' in globals():
-                        st.error(f"❌ Batch {current_batch} failed: {str(batch_error)}")
-                
-                # Small delay to prevent overwhelming
-                time.sleep(0.1)
-                
+            ModelManager.get_model("sentiment")
+            ModelManager.get_model("keyword")
         except Exception as model_error:
             if 'streamlit' in globals():
                 st.error(f"❌ Model loading or initialization failed: {str(model_error)}")
             raise model_error
         
-        df = pd.DataFrame(results)
+        offsets = list(range(0, len(texts), PARALLEL_CHUNK_SIZE))
+        chunks = [texts[offset:offset + PARALLEL_CHUNK_SIZE] for offset in offsets]
+        # One GPU cannot hold a model copy per worker, so CUDA runs stay in-process
+        max_workers = 1 if torch.cuda.is_available() else min(len(chunks), PROCESS_POOL_WORKERS)
+        
+        if 'streamlit' in globals():
+            st.info(f"🔄 Processing {len(texts)} texts in {len(chunks)} chunk(s) with {max_workers} worker(s)...")
+        
+        if max_workers > 1:
+            try:
+                parts = list(_get_process_pool().map(
+                    _process_chunk,
+                    chunks,
+                    offsets,
+                    [batch_size] * len(chunks),
+                    [fast_path] * len(chunks)
+                ))
+            except BrokenProcessPool:
+                _discard_process_pool()
+                raise
+        else:
+            # ONNX Runtime sessions are capped per pass, so several can share the cores.
+            # Torch's intra-op pool is process-wide (and a GPU serializes passes anyway),
+            # so the torch model runs one pass at a time on all of its threads.
+            _, model = ModelManager.get_raw("sentiment")
+            threads = 1 if isinstance(model, torch.nn.Module) else INFERENCE_THREADS
+            parts = [
+                _process_chunk(chunk, offset, batch_size, fast_path, threads)
+                for chunk, offset in zip(chunks, offsets)
+            ]
+        
+        df = pd.concat(parts, ignore_index=True).take(row_codes).reset_index(drop=True)
         
         if 'streamlit' in globals():
             successful_count = len(df[~df['sentiment'].str.contains('Failed|Error', na=False)])
-            st.success(f"✅ Batch processing completed! {successful_count}/{len(texts)} texts processed successfully.")
+            st.success(f"✅ Batch processing completed! {successful_count}/{len(df)} texts processed successfully.")
         
         return df
 
@@ -318,6 +701,10 @@ def optimize_memory_usage(df: pd.DataFrame) -> pd.DataFrame:
     Args:
         df: DataFrame to optimize
     """
+    # Known label set: use the shared ordered dtype so counts and sorts work on int8 codes
+    if 'sentiment' in df.columns and df['sentiment'].isin(SENTIMENT_DTYPE.categories).all():
+        df['sentiment'] = df['sentiment'].astype(SENTIMENT_DTYPE)
+    
     for col in df.columns:
         if df[col].dtype == 'object':
             df[col] = df[col].astype('category')
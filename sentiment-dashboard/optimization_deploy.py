@@ -176,30 +176,40 @@ class DeploymentOptimizedProcessor:
                     st.warning("⚠️ Memory limit reached, stopping processing")
                     break
                 
-                for j, text in enumerate(batch):
+                # Truncate long texts
+                batch = [text[:1000] + "..." if len(text) > 1000 else text for text in batch]
+                
+                # Sentiment analysis: one model call per batch instead of one per text
+                if sentiment_model == "rule_based":
+                    sentiment_results = [cls.simple_sentiment_analysis(text) for text in batch]
+                else:
                     try:
-                        # Truncate long texts
-                        if len(text) > 1000:
-                            text = text[:1000] + "..."
-                        
-                        # Sentiment analysis
-                        if sentiment_model == "rule_based":
-                            sentiment_result = cls.simple_sentiment_analysis(text)
-                        else:
+                        sentiment_results = sentiment_model(batch)
+                    except Exception as batch_error:
+                        # Retry text by text so one bad input only degrades itself
+                        sentiment_results = []
+                        fallback_count = 0
+                        for text in batch:
                             try:
-                                sentiment_result = sentiment_model(text)[0]
+                                sentiment_results.append(sentiment_model(text)[0])
                             except Exception:
-                                sentiment_result = cls.simple_sentiment_analysis(text)
-                        
-                        # Map sentiment
-                        label = sentiment_result['label'].upper()
-                        if 'POSITIVE' in label or label == 'LABEL_2':
-                            sentiment = "Positive"
-                        elif 'NEGATIVE' in label or label == 'LABEL_0':
-                            sentiment = "Negative"
-                        else:
-                            sentiment = "Neutral"
-                        
+                                sentiment_results.append(cls.simple_sentiment_analysis(text))
+                                fallback_count += 1
+                        if fallback_count:
+                            st.warning(f"⚠️ Batch {batch_num} failed ({str(batch_error)}); {fallback_count} of {len(batch)} texts used rule-based analysis")
+                
+                # Map sentiment labels and scores for the whole batch at once
+                labels = np.char.upper(np.array([result['label'] for result in sentiment_results], dtype=str))
+                is_positive = (np.char.find(labels, 'POSITIVE') >= 0) | (labels == 'LABEL_2')
+                is_negative = (np.char.find(labels, 'NEGATIVE') >= 0) | (labels == 'LABEL_0')
+                sentiments = np.where(is_positive, "Positive", np.where(is_negative, "Negative", "Neutral")).tolist()
+                confidences = np.round(
+                    np.fromiter((result['score'] for result in sentiment_results), dtype=np.float64, count=len(batch)),
+                    3
+                ).tolist()
+                
+                for j, text in enumerate(batch):
+                    try:
                         # Simple keyword extraction
                         keywords = cls.extract_simple_keywords(text)
                         
@@ -208,8 +218,8 @@ class DeploymentOptimizedProcessor:
                         
                         results.append({
                             'text': text,
-                            'sentiment': sentiment,
-                            'confidence': round(sentiment_result['score'], 3),
+                            'sentiment': sentiments[j],
+                            'confidence': confidences[j],
                             'keywords': ', '.join(keywords),
                             'use_case': use_case
                         })
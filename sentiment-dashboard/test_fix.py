@@ -16,6 +16,141 @@ except ImportError as e:
     print(f"❌ Failed to import utils: {e}")
     sys.exit(1)
 
+def test_model_singleton():
+    """Verify the models are only loaded once, through ModelManager"""
+    from optimization import ModelManager
+    import utils
+    
+    print("\n🔁 Testing Model Singleton:")
+    print("=" * 50)
+    
+    assert ModelManager.get_model("sentiment") is utils.sentiment_analyzer
+    assert ModelManager.get_model("keyword") is utils.keyword_model
+    print("✅ utils reuses the ModelManager instances")
+
+def test_chart_png_export():
+    """Verify a chart renders to PNG for the PDF export"""
+    import plotly.graph_objects as go
+    from visualizations import convert_plotly_fig_to_bytes
+    
+    print("\n🖼️ Testing Chart PNG Export:")
+    print("=" * 50)
+    
+    fig = go.Figure(go.Bar(x=["Positive", "Negative"], y=[3, 1]))
+    buf = convert_plotly_fig_to_bytes(fig)
+    assert buf is not None, "chart conversion returned None"
+    assert buf.getvalue().startswith(b"\x89PNG"), "chart conversion did not produce a PNG"
+    print("✅ Chart rendered to PNG")
+
+def test_batch_dedup_order():
+    """Verify duplicate texts are analyzed once and rows come back in input order"""
+    from optimization import BatchProcessor
+    
+    print("\n🧮 Testing Batch Dedup and Order:")
+    print("=" * 50)
+    
+    texts = [
+        "I love this product!",
+        "This is terrible.",
+        "I love this product!",
+        "It's okay, nothing special.",
+        "This is terrible."
+    ]
+    df = BatchProcessor.process_batch(texts)
+    
+    assert df['text'].tolist() == texts, "rows are not in input order"
+    assert df.iloc[0].equals(df.iloc[2]), "duplicate texts got different results"
+    assert df.iloc[1].equals(df.iloc[4]), "duplicate texts got different results"
+    print(f"✅ {len(texts)} rows restored from {len(set(texts))} distinct texts")
+
+def test_keyword_batch_vocabulary():
+    """Verify shared-vocabulary keyword extraction matches per-text KeyBERT"""
+    from optimization import _extract_keywords_batch, _extract_keyword_str
+    import utils
+    
+    print("\n🔑 Testing Shared-Vocabulary Keywords:")
+    print("=" * 50)
+    
+    texts = [
+        "The battery life of this phone is excellent.",
+        "Battery drains fast and the screen cracked.",
+        "Customer service answered every question quickly.",
+        "the and of"
+    ]
+    positions = list(range(1, len(texts) + 1))
+    batched = _extract_keywords_batch(utils.keyword_model, texts, positions)
+    
+    assert len(batched) == len(texts)
+    assert batched[-1] == '', "a stop-word-only text should get no keywords"
+    for text, position, keywords in zip(texts[:-1], positions, batched):
+        expected = _extract_keyword_str(utils.keyword_model, text, position)
+        assert set(keywords.split(', ')) == set(expected.split(', ')), f"{keywords!r} != {expected!r}"
+        print(f"✅ {text[:30]}... -> {keywords}")
+
+def test_valid_text_mask():
+    """Verify the vectorized validator agrees with validate_text_input"""
+    import pandas as pd
+    from utils import valid_text_mask
+    
+    print("\n🧹 Testing Vectorized Text Validation:")
+    print("=" * 50)
+    
+    samples = [
+        "",
+        "   ",
+        "ok",
+        "Great product, works well.",
+        "  padded text  ",
+        "!!!@@@###$$$",
+        "12345 67890",
+        "line\n" * 60,
+        "x" * 5001,
+        "Café déjà vu, naïve résumé",
+        "snake_case_words_everywhere"
+    ]
+    mask = valid_text_mask(pd.Series(samples))
+    
+    for text, is_valid in zip(samples, mask):
+        assert is_valid == (validate_text_input(text) is None), f"mismatch for {text[:20]!r}"
+    print(f"✅ {len(samples)} samples agree ({int(mask.sum())} valid)")
+
+def test_confidence_histogram():
+    """Verify the confidence histogram covers [0, 1] and counts every finite score"""
+    import numpy as np
+    from visualizations import _confidence_histogram
+    
+    print("\n📊 Testing Confidence Histogram:")
+    print("=" * 50)
+    
+    values = np.array([0.0, 0.05, 0.5, 0.99, 1.0, np.nan])
+    counts, edges = _confidence_histogram(values)
+    
+    assert counts.sum() == 5, "NaN scores should be skipped"
+    assert edges[0] == 0.0 and edges[-1] == 1.0 and len(edges) == len(counts) + 1
+    assert counts[0] == 1 and counts[1] == 1 and counts[10] == 1
+    assert counts[-1] == 2, "1.0 should land in the last bin"
+    print("✅ Counts and bin edges match np.histogram semantics")
+
+def test_sentiment_dtype():
+    """Verify optimize_memory_usage stores known labels as SENTIMENT_DTYPE"""
+    import pandas as pd
+    from optimization import optimize_memory_usage, SENTIMENT_DTYPE
+    
+    print("\n🗜️ Testing Sentiment Dtype:")
+    print("=" * 50)
+    
+    df = optimize_memory_usage(pd.DataFrame({
+        'sentiment': ['Positive', 'Very Negative', 'Neutral'],
+        'confidence': [0.9, 0.7, 0.6]
+    }))
+    assert df['sentiment'].dtype == SENTIMENT_DTYPE
+    # Ordered from most positive to most negative
+    assert df['sentiment'].sort_values().tolist() == ['Positive', 'Neutral', 'Very Negative']
+    
+    other = optimize_memory_usage(pd.DataFrame({'sentiment': ['Positive', 'Unknown']}))
+    assert other['sentiment'].dtype != SENTIMENT_DTYPE, "unknown labels must keep their values"
+    print("✅ Sentiment column uses the ordered label dtype")
+
 def test_sentiment_analysis():
     """Test basic sentiment analysis functionality"""
     test_texts = [
@@ -108,6 +243,19 @@ if __name__ == "__main__":
     print("=" * 60)
     
     try:
+        # Test that models are shared rather than re-loaded
+        test_model_singleton()
+        
+        # Test that charts render for the PDF export
+        test_chart_png_export()
+        
+        # Test the batch pipeline helpers
+        test_batch_dedup_order()
+        test_keyword_batch_vocabulary()
+        test_valid_text_mask()
+        test_confidence_histogram()
+        test_sentiment_dtype()
+        
         # Test basic functionality
         test_sentiment_analysis()
         
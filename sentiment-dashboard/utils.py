@@ -1,16 +1,16 @@
+import base64
+import functools
 import pandas as pd
 import streamlit as st
-import tempfile
-import pdfkit
-from transformers import pipeline
-from keybert import KeyBERT
 import json
-import base64
+import mimetypes
+import os
 from io import BytesIO
+from xml.sax.saxutils import escape
 import plotly.graph_objects as go
-from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from sklearn.metrics import confusion_matrix, classification_report
 from optimization import (
     ModelManager,
@@ -18,8 +18,17 @@ from optimization import (
     handle_errors,
     optimize_memory_usage
 )
-from visualizations import convert_plotly_fig_to_bytes, optimize_chart_for_pdf
-from reportlab.platypus import Table, TableStyle
+from visualizations import convert_plotly_fig_to_bytes, optimize_chart_for_pdf, get_sentiment_counts
+from reportlab.platypus import (
+    SimpleDocTemplate,
+    Paragraph,
+    Spacer,
+    Table,
+    TableStyle,
+    Image,
+    PageBreak,
+    KeepTogether
+)
 
 # Initialize models using ModelManager
 sentiment_analyzer = ModelManager.get_model("sentiment")
@@ -40,6 +49,87 @@ MODEL_LIMITATIONS = {
     'very_low_confidence_threshold': 0.40,  # New threshold for very low confidence
 }
 
+# PDF report styling, built once at import and shared by every export
+_REPORT_HEADER_COLOR = colors.HexColor('#4F46E5')  # Matches app theme
+_REPORT_TEXT_COLOR = colors.HexColor('#1F2937')    # Dark gray for text
+_REPORT_LIGHT_GRAY = colors.HexColor('#F9FAFB')    # Very light gray
+_REPORT_BORDER_COLOR = colors.HexColor('#E5E7EB')  # Light border/grid color
+
+_REPORT_STYLES = getSampleStyleSheet()
+_REPORT_STYLES.add(ParagraphStyle(
+    'ReportSection', fontName='Helvetica-Bold', fontSize=16, leading=20,
+    textColor=_REPORT_TEXT_COLOR, spaceBefore=14, spaceAfter=12
+))
+_REPORT_STYLES.add(ParagraphStyle(
+    'ReportSubsection', fontName='Helvetica-Bold', fontSize=14, leading=18,
+    textColor=_REPORT_TEXT_COLOR, spaceBefore=18, spaceAfter=8
+))
+_REPORT_STYLES.add(ParagraphStyle(
+    'ReportBody', fontName='Helvetica', fontSize=12, leading=20, textColor=_REPORT_TEXT_COLOR
+))
+_REPORT_STYLES.add(ParagraphStyle(
+    'ReportSmall', fontName='Helvetica', fontSize=11, leading=15, textColor=_REPORT_TEXT_COLOR
+))
+_REPORT_STYLES.add(ParagraphStyle(
+    'ReportNote', fontName='Helvetica-Oblique', fontSize=8, leading=10, textColor=colors.grey
+))
+_REPORT_STYLES.add(ParagraphStyle(
+    'ReportError', fontName='Helvetica', fontSize=10, leading=14, textColor=colors.grey, spaceBefore=6
+))
+
+_STATS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), _REPORT_LIGHT_GRAY),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 12),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 11),
+    ('TEXTCOLOR', (0, 0), (-1, -1), _REPORT_TEXT_COLOR),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.HexColor('#FAFAFA'), colors.white]),
+    ('GRID', (0, 0), (-1, -1), 0.5, _REPORT_BORDER_COLOR),
+    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ('TOPPADDING', (0, 0), (-1, -1), 3),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+])
+
+_RESULTS_TABLE_STYLE = TableStyle([
+    # Header styling - light header with dark text for better readability
+    ('BACKGROUND', (0, 0), (-1, 0), _REPORT_LIGHT_GRAY),
+    ('TEXTCOLOR', (0, 0), (-1, 0), _REPORT_TEXT_COLOR),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),  # Slightly larger for readability
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('TOPPADDING', (0, 0), (-1, 0), 6),
+    
+    # Data rows styling - ensure white background for readability
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('TEXTCOLOR', (0, 1), (-1, -1), _REPORT_TEXT_COLOR),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),  # Larger font for better readability
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#FAFAFA')]),  # Very light alternating
+    
+    # Grid styling - lighter grid lines
+    ('GRID', (0, 0), (-1, -1), 0.5, _REPORT_BORDER_COLOR),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('LEFTPADDING', (0, 0), (-1, -1), 4),  # More padding for readability
+    ('RIGHTPADDING', (0, 0), (-1, -1), 4),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    
+    # Text wrapping and overflow handling
+    ('WORDWRAP', (0, 0), (-1, -1), 'LTR'),
+    ('OVERFLOW', (0, 0), (-1, -1), 'TRUNCATE'),
+])
+
+# Model star label -> (detailed sentiment label, raw 1-5 score)
+LABEL2SENT = {
+    '1 star': ('Very Negative', 1),
+    '2 stars': ('Negative', 2),
+    '3 stars': ('Neutral', 3),
+    '4 stars': ('Positive', 4),
+    '5 stars': ('Very Positive', 5),
+}
+
 @handle_errors
 @timed_cache(ttl=3600)
 def analyze_sentiment(text):
@@ -57,18 +147,8 @@ def analyze_sentiment(text):
     - Competitive intelligence
     """
     result = sentiment_analyzer(text)[0]
-    # Convert 1-5 score to detailed sentiment labels
-    score = int(result['label'].split()[0])
-    if score == 1:
-        sentiment = "Very Negative"
-    elif score == 2:
-        sentiment = "Negative"
-    elif score == 3:
-        sentiment = "Neutral"
-    elif score == 4:
-        sentiment = "Positive"
-    else:  # score == 5
-        sentiment = "Very Positive"
+    # Map the model's star label to a detailed sentiment label and 1-5 score
+    sentiment, score = LABEL2SENT[result['label']]
     
     return {
         'text': text,
@@ -246,57 +326,84 @@ def extract_keywords(text, top_n=5):
     )
     return [keyword[0] for keyword in keywords]
 
+def _draw_report_page(c, doc, generated_on):
+    """Draw the header band and footer that appear on every report page."""
+    width, height = letter
+    c.saveState()
+    
+    # Header background
+    c.setFillColor(_REPORT_HEADER_COLOR)
+    c.rect(0, height-80, width, 80, fill=1, stroke=0)
+    
+    # Title
+    c.setFillColor(colors.white)
+    c.setFont("Helvetica-Bold", 24)
+    c.drawCentredString(width/2, height-35, "Sentiment Analysis Report")
+    
+    # Subtitle
+    c.setFont("Helvetica", 12)
+    c.drawCentredString(width/2, height-55, "Professional Analysis Results")
+    
+    # Date and time
+    c.setFont("Helvetica", 10)
+    c.drawCentredString(width/2, height-70, f"Generated on {generated_on}")
+    
+    # Footer
+    c.setFont("Helvetica", 8)
+    c.setFillColor(colors.grey)
+    c.drawCentredString(width/2, 30, "Generated by Sentiment Analysis Dashboard - Tech Titanians")
+    c.restoreState()
+
+def _bordered_image(image_buf, img_width, img_height, border_color):
+    """Wrap a PNG buffer in a single-cell table that draws a border around it."""
+    image_buf.seek(0)
+    framed = Table([[Image(image_buf, width=img_width, height=img_height)]])
+    framed.setStyle(TableStyle([
+        ('BOX', (0, 0), (-1, -1), 1, border_color),
+        ('LEFTPADDING', (0, 0), (-1, -1), 5),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+        ('TOPPADDING', (0, 0), (-1, -1), 5),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+    ]))
+    framed.hAlign = 'LEFT'
+    return framed
+
 @handle_errors
 def export_to_pdf(df, visualizations):
     """
     Export analysis results and visualizations to PDF using reportlab with professional styling.
     """
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=letter)
-    width, height = letter
+    from datetime import datetime
     
-    # Define colors and styles
-    header_color = colors.HexColor('#4F46E5')  # Changed to match app theme
-    accent_color = colors.HexColor('#10B981')  # Green accent
-    text_color = colors.HexColor('#1F2937')    # Dark gray for text
-    light_gray = colors.HexColor('#F9FAFB')    # Very light gray
-    white_bg = colors.white                    # Pure white background
-    
-    # Page 1: Title and Executive Summary
-    def draw_header():
-        # Header background
-        c.setFillColor(header_color)
-        c.rect(0, height-80, width, 80, fill=1, stroke=0)
-        
-        # Title
-        c.setFillColor(colors.white)
-        c.setFont("Helvetica-Bold", 24)
-        c.drawCentredString(width/2, height-35, "Sentiment Analysis Report")
-        
-        # Subtitle
-        c.setFont("Helvetica", 12)
-        c.drawCentredString(width/2, height-55, "Professional Analysis Results")
-        
-        # Date and time
-        from datetime import datetime
-        current_time = datetime.now().strftime("%B %d, %Y at %I:%M %p")
-        c.setFont("Helvetica", 10)
-        c.drawCentredString(width/2, height-70, f"Generated on {current_time}")
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=letter,
+        leftMargin=50,
+        rightMargin=50,
+        topMargin=110,
+        bottomMargin=50,
+        pageCompression=1,
+        title="Sentiment Analysis Report"
+    )
+    generated_on = datetime.now().strftime("%B %d, %Y at %I:%M %p")
+    story = []
     
-    draw_header()
+    # Add sentiment distribution chart - handle any chart type dynamically
+    charts = [
+        (viz_name, fig) for viz_name, fig in visualizations.items()
+        if "Sentiment Distribution" in viz_name and fig is not None
+    ][:1]  # Only add one chart type
     
-    # Executive Summary Section
-    y_position = height - 120
-    c.setFillColor(text_color)
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y_position, "Executive Summary")
+    # Page 1: Executive Summary
+    story.append(Paragraph("Executive Summary", _REPORT_STYLES['ReportSection']))
     
     # Summary statistics - handle both uppercase and lowercase column names
     sentiment_col = 'sentiment' if 'sentiment' in df.columns else 'Sentiment'
     confidence_col = 'confidence' if 'confidence' in df.columns else 'Confidence'
     use_case_col = 'use_case' if 'use_case' in df.columns else 'Use_Case'
     
-    # Handle different text column names
+    # Handle different text column names for different analysis types
     text_col = None
     if 'text' in df.columns:
         text_col = 'text'
@@ -318,117 +425,68 @@ def export_to_pdf(df, visualizations):
     elif 'Key_Phrases' in df.columns:
         keywords_col = 'Key_Phrases'
     
-    sentiment_counts = df[sentiment_col].value_counts()
+    sentiment_order = ['Very Positive', 'Positive', 'Neutral', 'Negative', 'Very Negative']
+    sentiment_counts = get_sentiment_counts(df, sentiment_col)
+    ordered_counts = sentiment_counts.reindex(sentiment_order, fill_value=0)
     total_texts = len(df)
     
-    # Calculate percentages
-    sentiment_percentages = {
-        sentiment: (count / total_texts) * 100 
-        for sentiment, count in sentiment_counts.items()
-    }
-    
     # Determine dominant sentiment
     dominant_sentiment = sentiment_counts.index[0]
-    dominant_percentage = sentiment_percentages[dominant_sentiment]
+    dominant_percentage = (sentiment_counts.iloc[0] / total_texts) * 100
     
     # Executive summary text
-    y_position -= 30
-    c.setFont("Helvetica", 12)
     summary_text = [
         f"Analysis of {total_texts} text entries reveals the following sentiment distribution:",
         f"• {dominant_sentiment} sentiment dominates at {dominant_percentage:.1f}% of responses",
         f"• Average confidence score: {df[confidence_col].mean():.3f}",
         f"• Most common use case: {df[use_case_col].mode().iloc[0] if use_case_col in df.columns else 'General Analysis'}"
     ]
-    
     for line in summary_text:
-        c.drawString(50, y_position, line)
-        y_position -= 20
+        story.append(Paragraph(escape(line), _REPORT_STYLES['ReportBody']))
     
     # Detailed Statistics Section
-    y_position -= 30
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y_position, "Detailed Statistics")
-    
-    # Create statistics table
-    y_position -= 30
+    story.append(Paragraph("Detailed Statistics", _REPORT_STYLES['ReportSection']))
     
     # Sentiment distribution table
-    sentiment_order = ['Very Positive', 'Positive', 'Neutral', 'Negative', 'Very Negative']
+    stats_data = [["Sentiment Class", "Count", "Percentage", "Confidence Range"]]
+    
+    # Confidence range per sentiment in one grouped pass instead of a mask per class
+    conf_ranges = df.groupby(sentiment_col, observed=True, sort=False)[confidence_col].agg(['min', 'max'])
     
-    # Table headers - improved readability
-    c.setFont("Helvetica-Bold", 12)
-    c.setFillColor(light_gray)
-    c.rect(50, y_position-20, 450, 20, fill=1, stroke=1)
-    c.setStrokeColor(colors.HexColor('#E5E7EB'))
-    c.setFillColor(text_color)
-    c.drawString(60, y_position-15, "Sentiment Class")
-    c.drawString(200, y_position-15, "Count")
-    c.drawString(280, y_position-15, "Percentage")
-    c.drawString(380, y_position-15, "Confidence Range")
-    
-    y_position -= 20
-    
-    # Table rows
-    c.setFont("Helvetica", 11)
-    for sentiment in sentiment_order:
-        count = sentiment_counts.get(sentiment, 0)
-        percentage = sentiment_percentages.get(sentiment, 0)
+    for sentiment, count in ordered_counts.items():
+        percentage = (count / total_texts) * 100
         
-        # Get confidence range for this sentiment
-        sentiment_data = df[df[sentiment_col] == sentiment][confidence_col] if count > 0 else []
-        if len(sentiment_data) > 0:
-            conf_min = sentiment_data.min()
-            conf_max = sentiment_data.max()
+        if count > 0 and sentiment in conf_ranges.index:
+            conf_min, conf_max = conf_ranges.loc[sentiment]
             conf_range = f"{conf_min:.3f} - {conf_max:.3f}"
         else:
             conf_range = "N/A"
         
-        # Alternate row colors
-        if sentiment_order.index(sentiment) % 2 == 0:
-            c.setFillColor(colors.HexColor('#FAFAFA'))  # Very light gray instead of dark
-            c.rect(50, y_position-15, 450, 15, fill=1, stroke=1)
-        else:
-            c.setFillColor(white_bg)  # Pure white background
-            c.rect(50, y_position-15, 450, 15, fill=1, stroke=1)
-        
-        c.setFillColor(text_color)  # Ensure text is dark for contrast
-        c.drawString(60, y_position-10, sentiment)
-        c.drawString(200, y_position-10, str(count))
-        c.drawString(280, y_position-10, f"{percentage:.1f}%")
-        c.drawString(380, y_position-10, conf_range)
-        y_position -= 15
+        stats_data.append([sentiment, str(count), f"{percentage:.1f}%", conf_range])
+    
+    stats_table = Table(stats_data, colWidths=[140, 80, 100, 130])
+    stats_table.setStyle(_STATS_TABLE_STYLE)
+    stats_table.hAlign = 'LEFT'
+    story.append(stats_table)
     
     # Use Case Analysis (if available)
     if use_case_col in df.columns:
-        y_position -= 30
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(50, y_position, "Use Case Distribution")
+        story.append(Paragraph("Use Case Distribution", _REPORT_STYLES['ReportSubsection']))
         
         use_case_counts = df[use_case_col].value_counts()
-        y_position -= 20
-        c.setFont("Helvetica", 11)
-        
         for use_case, count in use_case_counts.head(5).items():
             percentage = (count / total_texts) * 100
-            c.drawString(60, y_position, f"• {use_case}: {count} ({percentage:.1f}%)")
-            y_position -= 15
+            story.append(Paragraph(escape(f"• {use_case}: {count} ({percentage:.1f}%)"), _REPORT_STYLES['ReportSmall']))
     
     # Key Insights Section
-    y_position -= 30
-    c.setFont("Helvetica-Bold", 14)
-    c.drawString(50, y_position, "Key Insights")
-    
-    y_position -= 20
-    c.setFont("Helvetica", 11)
+    story.append(Paragraph("Key Insights", _REPORT_STYLES['ReportSubsection']))
     
     # Generate insights based on data
     insights = []
     
     # Sentiment insights
-    positive_sentiment = sentiment_counts.get('Very Positive', 0) + sentiment_counts.get('Positive', 0)
-    negative_sentiment = sentiment_counts.get('Very Negative', 0) + sentiment_counts.get('Negative', 0)
-    neutral_sentiment = sentiment_counts.get('Neutral', 0)
+    positive_sentiment = ordered_counts['Very Positive'] + ordered_counts['Positive']
+    negative_sentiment = ordered_counts['Very Negative'] + ordered_counts['Negative']
     
     if positive_sentiment > negative_sentiment:
         insights.append(f"• Overall positive sentiment detected ({((positive_sentiment/total_texts)*100):.1f}% positive vs {((negative_sentiment/total_texts)*100):.1f}% negative)")
@@ -450,50 +508,16 @@ def export_to_pdf(df, visualizations):
         insights.append("• High variability in confidence scores detected")
     
     for insight in insights:
-        c.drawString(50, y_position, insight)
-        y_position -= 15
-    
-    # Start new page for detailed results
-    c.showPage()
+        story.append(Paragraph(escape(insight), _REPORT_STYLES['ReportSmall']))
     
     # Page 2: Detailed Analysis Results
-    draw_header()
-    
-    y_position = height - 120
-    c.setFillColor(text_color)
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y_position, "Detailed Analysis Results")
+    story.append(PageBreak())
+    story.append(Paragraph("Detailed Analysis Results", _REPORT_STYLES['ReportSection']))
     
-    # Prepare table data with better formatting
-    y_position -= 30
     max_rows_per_page = 15  # Reduce rows to fit better
     
     # Column headers - make them even shorter
     headers = ['Text (30 chars)', 'Sentiment', 'Conf.', 'Keywords', 'Use Case']
-    
-    # Handle different text column names for different analysis types
-    text_col = None
-    if 'text' in df.columns:
-        text_col = 'text'
-    elif 'Content_Preview' in df.columns:
-        text_col = 'Content_Preview'
-    elif 'Label' in df.columns:
-        text_col = 'Label'
-    else:
-        # Fallback to first string column
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                text_col = col
-                break
-    
-    # Handle different keyword column names
-    keywords_col = None
-    if 'keywords' in df.columns:
-        keywords_col = 'keywords'
-    elif 'Key_Phrases' in df.columns:
-        keywords_col = 'Key_Phrases'
-    
-    # Create table data
     table_data = [headers]
     
     for idx, row in df.head(max_rows_per_page).iterrows():
@@ -532,205 +556,96 @@ def export_to_pdf(df, visualizations):
             }
             sentiment = sentiment_map.get(sentiment, sentiment[:8])
         
-        row_data = [
+        table_data.append([
             text_display,
             sentiment,
             f"{row[confidence_col]:.2f}",  # Shorter confidence format
             keywords_display,
             str(use_case)
-        ]
-        
-        table_data.append(row_data)
-    
-    # Create and style the table with much smaller column widths
-    from reportlab.platypus import Table, TableStyle
+        ])
     
     # Further reduce column widths to prevent overlap - total around 480
     col_widths = [150, 60, 40, 90, 70]  # Much more conservative widths
     
     table = Table(table_data, colWidths=col_widths, repeatRows=1)
-    table.setStyle(TableStyle([
-        # Header styling - light header with dark text for better readability
-        ('BACKGROUND', (0, 0), (-1, 0), light_gray),
-        ('TEXTCOLOR', (0, 0), (-1, 0), text_color),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 9),  # Slightly larger for readability
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-        ('TOPPADDING', (0, 0), (-1, 0), 6),
-        
-        # Data rows styling - ensure white background for readability
-        ('BACKGROUND', (0, 1), (-1, -1), white_bg),
-        ('TEXTCOLOR', (0, 1), (-1, -1), text_color),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 8),  # Larger font for better readability
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [white_bg, colors.HexColor('#FAFAFA')]),  # Very light alternating
-        
-        # Grid styling - lighter grid lines
-        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#E5E7EB')),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 4),  # More padding for readability
-        ('RIGHTPADDING', (0, 0), (-1, -1), 4),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        
-        # Text wrapping and overflow handling
-        ('WORDWRAP', (0, 0), (-1, -1), 'LTR'),
-        ('OVERFLOW', (0, 0), (-1, -1), 'TRUNCATE'),
-    ]))
-    
-    # Draw table
-    table_width, table_height = table.wrapOn(c, width-100, height)
-    table.drawOn(c, 50, y_position-table_height)
+    table.setStyle(_RESULTS_TABLE_STYLE)
+    table.hAlign = 'LEFT'
+    story.append(table)
     
     # Add note about truncation if there are more rows
     if len(df) > max_rows_per_page:
-        y_position = y_position - table_height - 20
-        c.setFont("Helvetica-Oblique", 8)
-        c.setFillColor(colors.grey)
-        c.drawString(50, y_position, f"Note: Showing first {max_rows_per_page} results. Total records: {len(df)}")
-        c.drawString(50, y_position-10, "Text, keywords, and use cases are heavily truncated for display.")
-    
-    # Start new page for visualizations
-    c.showPage()
+        story.append(Spacer(1, 12))
+        story.append(Paragraph(f"Note: Showing first {max_rows_per_page} results. Total records: {len(df)}", _REPORT_STYLES['ReportNote']))
+        story.append(Paragraph("Text, keywords, and use cases are heavily truncated for display.", _REPORT_STYLES['ReportNote']))
     
     # Page 3: Visualizations
-    draw_header()
-    
-    y_position = height - 120
-    c.setFillColor(text_color)
-    c.setFont("Helvetica-Bold", 16)
-    c.drawString(50, y_position, "Data Visualizations")
+    story.append(PageBreak())
+    story.append(Paragraph("Data Visualizations", _REPORT_STYLES['ReportSection']))
     
-    # Add sentiment distribution chart - handle any chart type dynamically
-    chart_added = False
-    for viz_name, fig in visualizations.items():
-        if "Sentiment Distribution" in viz_name and fig is not None:
-            y_position -= 40
-            c.setFont("Helvetica-Bold", 14)
-            c.drawString(50, y_position, viz_name)  # Use the dynamic name from the visualizations dict
-            
-            try:
-                # Optimize chart for PDF export
-                optimized_fig = optimize_chart_for_pdf(fig)
-                plot_buf = convert_plotly_fig_to_bytes(optimized_fig)
-                if plot_buf is not None:  # Check if conversion was successful
-                    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                        tmp.write(plot_buf.getvalue())
-                        tmp_path = tmp.name
-                    
-                    # Draw chart with border
-                    chart_width, chart_height = 500, 250
-                    c.setStrokeColor(colors.HexColor('#E5E7EB'))  # Use lighter border color
-                    c.setLineWidth(1)
-                    c.rect(50, y_position-chart_height-10, chart_width, chart_height, fill=0, stroke=1)
-                    c.drawImage(tmp_path, 55, y_position-chart_height-5, width=chart_width-10, height=chart_height-10)
-                    
-                    import os
-                    os.unlink(tmp_path)
-                    y_position -= (chart_height + 40)
-                    chart_added = True
-                else:
-                    # Chart conversion failed, show error message
-                    c.setFont("Helvetica", 10)
-                    c.setFillColor(colors.grey)
-                    c.drawString(50, y_position-20, "Chart visualization temporarily unavailable")
-                    y_position -= 40
-            except Exception as e:
-                # Handle any chart conversion errors
-                c.setFont("Helvetica", 10)
-                c.setFillColor(colors.grey)
-                c.drawString(50, y_position-20, f"Chart error: {str(e)[:50]}...")
-                y_position -= 40
-            break  # Only add one chart type
-    
-    # Fallback if no sentiment distribution chart was found
-    if not chart_added and "Sentiment Distribution" in visualizations:
-        fig = visualizations["Sentiment Distribution"]
-        if fig is not None:
-            y_position -= 40
-            c.setFont("Helvetica-Bold", 14)
-            c.drawString(50, y_position, "Sentiment Distribution Chart")
-            
-            try:
-                # Optimize chart for PDF export
-                optimized_fig = optimize_chart_for_pdf(fig)
-                plot_buf = convert_plotly_fig_to_bytes(optimized_fig)
-                if plot_buf is not None:  # Check if conversion was successful
-                    with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                        tmp.write(plot_buf.getvalue())
-                        tmp_path = tmp.name
-                    
-                    # Draw chart with border
-                    chart_width, chart_height = 500, 250
-                    c.setStrokeColor(colors.HexColor('#E5E7EB'))
-                    c.setLineWidth(1)
-                    c.rect(50, y_position-chart_height-10, chart_width, chart_height, fill=0, stroke=1)
-                    c.drawImage(tmp_path, 55, y_position-chart_height-5, width=chart_width-10, height=chart_height-10)
-                    
-                    import os
-                    os.unlink(tmp_path)
-                    y_position -= (chart_height + 40)
-                else:
-                    # Chart conversion failed, show error message
-                    c.setFont("Helvetica", 10)
-                    c.setFillColor(colors.grey)
-                    c.drawString(50, y_position-20, "Chart visualization temporarily unavailable")
-                    y_position -= 40
-            except Exception as e:
-                # Handle any chart conversion errors
-                c.setFont("Helvetica", 10)
-                c.setFillColor(colors.grey)
-                c.drawString(50, y_position-20, f"Chart error: {str(e)[:50]}...")
-                y_position -= 40
+    for viz_name, fig in charts:
+        chart_heading = Paragraph(escape(viz_name), _REPORT_STYLES['ReportSubsection'])
+        
+        # Optimize the chart for PDF export; conversion errors come back as None
+        plot_buf = convert_plotly_fig_to_bytes(optimize_chart_for_pdf(fig))
+        if plot_buf is not None:
+            story.append(KeepTogether([
+                chart_heading,
+                _bordered_image(plot_buf, 490, 240, _REPORT_BORDER_COLOR)
+            ]))
+        else:
+            # Chart conversion failed, show error message
+            story.append(chart_heading)
+            story.append(Paragraph("Chart visualization temporarily unavailable", _REPORT_STYLES['ReportError']))
     
     # Add word cloud if available
-    if "Word Cloud" in visualizations and y_position > 200:
-        wordcloud_buf = visualizations["Word Cloud"]
-        if wordcloud_buf is not None:
-            c.setFont("Helvetica-Bold", 14)
-            c.drawString(50, y_position, "Word Cloud Analysis")
-            
-            try:
-                with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-                    tmp.write(wordcloud_buf.getvalue())
-                    tmp_path = tmp.name
-                
-                # Draw word cloud with border
-                cloud_width, cloud_height = 500, 200
-                c.setStrokeColor(colors.grey)
-                c.setLineWidth(1)
-                c.rect(50, y_position-cloud_height-30, cloud_width, cloud_height, fill=0, stroke=1)
-                c.drawImage(tmp_path, 55, y_position-cloud_height-25, width=cloud_width-10, height=cloud_height-10)
-                
-                import os
-                os.unlink(tmp_path)
-            except Exception as e:
-                # Handle any word cloud errors
-                c.setFont("Helvetica", 10)
-                c.setFillColor(colors.grey)
-                c.drawString(50, y_position-20, f"Word cloud error: {str(e)[:50]}...")
-    
-    # Footer on last page
-    c.setFont("Helvetica", 8)
-    c.setFillColor(colors.grey)
-    footer_text = "Generated by Sentiment Analysis Dashboard - Tech Titanians"
-    text_width = c.stringWidth(footer_text)
-    c.drawString((width - text_width) / 2, 30, footer_text)
-    
-    c.save()
+    wordcloud_buf = visualizations.get("Word Cloud")
+    if wordcloud_buf is not None:
+        story.append(KeepTogether([
+            Paragraph("Word Cloud Analysis", _REPORT_STYLES['ReportSubsection']),
+            _bordered_image(wordcloud_buf, 490, 190, colors.grey)
+        ]))
+    
+    draw_page = functools.partial(_draw_report_page, generated_on=generated_on)
+    doc.build(story, onFirstPage=draw_page, onLaterPages=draw_page)
     buffer.seek(0)
     return buffer
 
+@st.cache_data(max_entries=16)
+def _read_download_bytes(file_path, mtime):
+    """Read a file for download; the mtime argument invalidates the cache when it changes."""
+    with open(file_path, 'rb') as f:
+        return f.read()
+
 @handle_errors
+def render_download_button(file_path, label_text):
+    """
+    Render a download button for a file and return whether it was clicked.
+    
+    The bytes are handed to st.download_button, which serves them from its
+    media endpoint instead of inlining a base64 data URI in the page. Reads
+    are cached per path and modification time, so reruns do not re-read
+    unchanged files.
+    """
+    data = _read_download_bytes(file_path, os.path.getmtime(file_path))
+    mime = mimetypes.guess_type(label_text)[0] or 'application/octet-stream'
+    return st.download_button(
+        label=f"Download {label_text}",
+        data=data,
+        file_name=label_text,
+        mime=mime
+    )
+
 def get_download_link(file_path, link_text):
     """
     Generate a download link for a file.
+    
+    Kept for callers that embed the HTML link; Streamlit pages should use
+    render_download_button instead.
     """
     with open(file_path, 'rb') as f:
         data = f.read()
     b64 = base64.b64encode(data).decode()
-    return f'<a href="data:application/octet-stream;base64,{b64}" download="{link_text}">Download {link_text}</a>' 
+    return f'<a href="data:application/octet-stream;base64,{b64}" download="{link_text}">Download {link_text}</a>'
 
 def handle_followup_question(question, text, sentiment_result, keywords):
     """
@@ -979,6 +894,21 @@ def validate_text_input(text):
     
     return None
 
+def valid_text_mask(texts):
+    """
+    Vectorized counterpart of validate_text_input for a whole column.
+    Returns a boolean Series that is True where validate_text_input would return None.
+    """
+    stripped = texts.astype(str).str.strip()
+    lengths = stripped.str.len()
+    # Share of alphanumeric or whitespace characters, as in validate_text_input
+    natural_ratio = stripped.str.count(r'[^\W_]|\s') / lengths.where(lengths > 0)
+    return (
+        lengths.between(3, 5000)
+        & stripped.str.count('\n').le(50)
+        & natural_ratio.ge(0.5)
+    )
+
 def validate_file_content(df, file_type):
     """
     Validate uploaded file content.
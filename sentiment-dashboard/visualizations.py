@@ -1,11 +1,45 @@
+import hashlib
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
+import plotly.io as pio
+from wordcloud import STOPWORDS, WordCloud
 from io import BytesIO
 import streamlit as st
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    # Route every plotly.io JSON encode (including st.plotly_chart) through orjson
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Word cloud tokenizer: runs of two or more letters, compiled once
+# WordCloud's own tokenizer: apostrophes stay inside words so contractions match STOPWORDS
+_WORD_RE = re.compile(r"\w[\w']*")
+_STOPWORDS_LOWER = frozenset(word.lower() for word in STOPWORDS)
+
+# Rendered PNG bytes keyed by a hash of the figure spec (LRU order)
+PNG_CACHE_SIZE = 64
+_PNG_CACHE = OrderedDict()
+_PNG_CACHE_LOCK = threading.Lock()
+
 # Dark mode detection function
 def detect_dark_mode():
     """
@@ -36,15 +70,115 @@ def get_theme_colors(dark_mode=False):
             'line_color': '#E5E7EB'
         }
 
-# Define consistent color scheme
+def _build_dashboard_template(dark_mode):
+    """Build the shared chart layout for one theme on top of Plotly's stock template."""
+    theme_colors = get_theme_colors(dark_mode)
+    template = go.layout.Template(pio.templates["plotly_dark" if dark_mode else "plotly"])
+    axis_style = dict(
+        linecolor=theme_colors['line_color'],
+        color=theme_colors['text_color'],
+        title_font=dict(size=14, family="Inter, sans-serif")
+    )
+    template.layout.update(
+        plot_bgcolor=theme_colors['bg_color'],
+        paper_bgcolor=theme_colors['paper_bg'],
+        font_color=theme_colors['text_color'],
+        title=dict(x=0.5, font=dict(size=20, family="Inter, sans-serif")),
+        margin=dict(t=80, b=60, l=60, r=60),
+        xaxis=dict(showgrid=False, **axis_style),
+        yaxis=dict(showgrid=True, gridcolor=theme_colors['grid_color'], **axis_style)
+    )
+    return template
+
+# Chart layouts are built once here; figures only reference them by name
+pio.templates["dashboard_dark"] = _build_dashboard_template(dark_mode=True)
+pio.templates["dashboard_light"] = _build_dashboard_template(dark_mode=False)
+
+def _dashboard_template(dark_mode):
+    """Name of the registered chart template for the given theme."""
+    return "dashboard_dark" if dark_mode else "dashboard_light"
+
+# Fully resolved themes: colours, the dark_mode flag and the registered template name
+_THEMES = {
+    dark_mode: {
+        **get_theme_colors(dark_mode),
+        'dark_mode': dark_mode,
+        'template_name': _dashboard_template(dark_mode)
+    }
+    for dark_mode in (True, False)
+}
+
+def resolve_theme(dark_mode=None):
+    """
+    Resolve the chart theme. The app stores the result in st.session_state['_theme']
+    once per rerun so chart builders do not each re-detect it.
+    """
+    if dark_mode is None:
+        dark_mode = detect_dark_mode()
+    return _THEMES[bool(dark_mode)]
+
+def _current_theme():
+    """Theme resolved by the app for this rerun, or the detected default outside it."""
+    return st.session_state.get('_theme') or resolve_theme()
+
+# On-screen sentiment palette shared by every chart builder (PDF exports use _PDF_COLORS)
 SENTIMENT_COLORS = {
-    'Very Positive': '#00a65a',  # Dark Green
-    'Positive': '#2ecc71',      # Light Green
-    'Neutral': '#95a5a6',       # Gray
-    'Negative': '#e74c3c',      # Light Red
-    'Very Negative': '#c0392b'  # Dark Red
+    'Very Positive': '#059669',   # Emerald-600
+    'Positive': '#10B981',        # Emerald-500
+    'Neutral': '#6B7280',         # Gray-500
+    'Negative': '#EF4444',        # Red-500
+    'Very Negative': '#DC2626'    # Red-600
 }
 
+def get_sentiment_counts(data, column='sentiment'):
+    """
+    Count sentiment labels, most frequent first, for the PDF export and chart builders.
+    Categorical columns are counted on their integer codes; other columns go
+    through _count_values, which is memoized on a hash of the column's values.
+    """
+    values = data[column]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Count integer category codes directly instead of hashing labels
+        category_counts = _count_codes(values.cat.codes.to_numpy(), len(values.cat.categories))
+        counts = pd.Series(category_counts, index=values.cat.categories.astype(object), name='count')
+        counts = counts.sort_values(ascending=False, kind='stable')
+    else:
+        counts = _count_values(values)
+    # Categorical columns report every category; charts only show labels that occur
+    return counts[counts > 0]
+
+def _hash_column(values):
+    """Hash only the column's values so memoized helpers ignore index and unrelated data."""
+    return pd.util.hash_pandas_object(values, index=False).values.tobytes()
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.Series: _hash_column})
+def _count_values(values):
+    """Memoized value_counts(), so widget-triggered reruns skip the pandas pass."""
+    return values.value_counts()
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, boundscheck=False)
+    def _count_codes(codes, n_categories):
+        """Count category codes in a single compiled pass; -1 (missing) is skipped."""
+        out = np.zeros(n_categories, np.int64)
+        for i in range(codes.size):
+            code = codes[i]
+            if code >= 0:
+                out[code] += 1
+        return out
+else:
+    def _count_codes(codes, n_categories):
+        """Count category codes with np.bincount; -1 (missing) is skipped."""
+        return np.bincount(codes[codes >= 0], minlength=n_categories)
+
+@st.cache_data(show_spinner=False)
+def _confidence_histogram(values, bins=20):
+    """Memoized (counts, bin edges) of the confidence scores over fixed [0, 1] bins."""
+    # Uniform bins on [0, 1]: the bin index is a scaled floor, so no edge search is needed
+    values = values[np.isfinite(values)]
+    bin_idx = np.clip((values * bins).astype(np.intp), 0, bins - 1)
+    return np.bincount(bin_idx, minlength=bins), np.linspace(0.0, 1.0, bins + 1)
+
 def create_sentiment_distribution(data, plot_type="bar", **kwargs):
     """
     Create enhanced sentiment distribution visualization with professional styling and dark mode support
@@ -53,157 +187,83 @@ def create_sentiment_distribution(data, plot_type="bar", **kwargs):
         if data is None or data.empty:
             return None
         
-        # Detect dark mode preference
-        dark_mode = detect_dark_mode()
-        theme_colors = get_theme_colors(dark_mode)
-        
-        # Professional color palette
-        colors = {
-            'Very Positive': '#059669',   # Emerald-600
-            'Positive': '#10B981',        # Emerald-500
-            'Neutral': '#6B7280',         # Gray-500
-            'Negative': '#EF4444',        # Red-500
-            'Very Negative': '#DC2626'    # Red-600
-        }
+        # Theme resolved once per rerun
+        theme = _current_theme()
         
         # Count sentiments
-        sentiment_counts = data['sentiment'].value_counts()
+        sentiment_counts = get_sentiment_counts(data)
         
-        # Create color list for the plot
-        plot_colors = [colors.get(sentiment, '#6B7280') for sentiment in sentiment_counts.index]
+        # Plain lists for the traces: labels, counts and per-label colors
+        labels = sentiment_counts.index.tolist()
+        values = sentiment_counts.tolist()
+        label_colors = [SENTIMENT_COLORS.get(sentiment, '#6B7280') for sentiment in labels]
         
         if plot_type == "bar":
-            fig = px.bar(
-                x=sentiment_counts.index, 
-                y=sentiment_counts.values,
-                color=sentiment_counts.index,
-                color_discrete_map=colors,
-                title="📊 Sentiment Distribution Analysis",
-                labels={'x': 'Sentiment Category', 'y': 'Number of Texts'}
-            )
-            
-            # Enhanced styling with dark mode support
-            fig.update_layout(
-                template="plotly_dark" if dark_mode else "plotly",
-                plot_bgcolor=theme_colors['bg_color'],
-                paper_bgcolor=theme_colors['paper_bg'],
-                font_color=theme_colors['text_color'],
-                title_font_size=20,
-                title_x=0.5,
-                title_font_family="Inter, sans-serif",
-                margin=dict(t=80, b=60, l=60, r=60),
-                showlegend=False,
-                xaxis=dict(
-                    showgrid=False,
-                    linecolor=theme_colors['line_color'],
-                    title_font_size=14,
-                    title_font_family="Inter, sans-serif",
-                    color=theme_colors['text_color']
-                ),
-                yaxis=dict(
-                    showgrid=True,
-                    gridcolor=theme_colors['grid_color'],
-                    linecolor=theme_colors['line_color'],
-                    title_font_size=14,
-                    title_font_family="Inter, sans-serif",
-                    color=theme_colors['text_color']
-                )
-            )
-            
-            # Add hover template
-            fig.update_traces(
+            # Add hover template with percentages preformatted as short strings
+            total = int(sentiment_counts.sum())
+            fig = go.Figure(go.Bar(
+                x=labels,
+                y=values,
+                marker_color=label_colors,
+                customdata=[f"{count * 100 / total:.1f}%" for count in values],
                 hovertemplate="<b>%{x}</b><br>" +
                              "Count: %{y}<br>" +
-                             "Percentage: %{customdata:.1%}<extra></extra>",
-                customdata=sentiment_counts.values / sentiment_counts.sum()
-            )
-            
-        elif plot_type == "pie":
-            fig = px.pie(
-                values=sentiment_counts.values,
-                names=sentiment_counts.index,
-                color=sentiment_counts.index,
-                color_discrete_map=colors,
-                title="🥧 Sentiment Distribution (Pie Chart)"
-            )
+                             "Percentage: %{customdata}<extra></extra>"
+            ))
             
+            # Enhanced styling with dark mode support
             fig.update_layout(
-                template="plotly_dark" if dark_mode else "plotly",
-                plot_bgcolor=theme_colors['bg_color'],
-                paper_bgcolor=theme_colors['paper_bg'],
-                font_color=theme_colors['text_color'],
-                title_font_size=20,
-                title_x=0.5,
-                title_font_family="Inter, sans-serif",
-                margin=dict(t=80, b=60, l=60, r=60)
+                template=theme['template_name'],
+                title_text="📊 Sentiment Distribution Analysis",
+                xaxis_title="Sentiment Category",
+                yaxis_title="Number of Texts",
+                showlegend=False
             )
             
-            fig.update_traces(
+        elif plot_type == "pie":
+            fig = go.Figure(go.Pie(
+                labels=labels,
+                values=values,
+                marker_colors=label_colors,
                 textposition='inside',
                 textinfo='percent+label',
                 hovertemplate="<b>%{label}</b><br>" +
                              "Count: %{value}<br>" +
                              "Percentage: %{percent}<extra></extra>"
+            ))
+            
+            fig.update_layout(
+                template=theme['template_name'],
+                title_text="🥧 Sentiment Distribution (Pie Chart)"
             )
             
         elif plot_type == "donut":
-            fig = px.pie(
-                values=sentiment_counts.values,
-                names=sentiment_counts.index,
-                color=sentiment_counts.index,
-                color_discrete_map=colors,
-                title="🍩 Sentiment Distribution (Donut Chart)",
+            fig = go.Figure(go.Pie(
+                labels=labels,
+                values=values,
+                marker_colors=label_colors,
                 hole=0.4
-            )
+            ))
             
             fig.update_layout(
-                template="plotly_dark" if dark_mode else "plotly",
-                plot_bgcolor=theme_colors['bg_color'],
-                paper_bgcolor=theme_colors['paper_bg'],
-                font_color=theme_colors['text_color'],
-                title_font_size=20,
-                title_x=0.5,
-                title_font_family="Inter, sans-serif",
-                margin=dict(t=80, b=60, l=60, r=60),
-                annotations=[dict(text='Sentiment<br>Analysis', x=0.5, y=0.5, font_size=16, showarrow=False, font_color=theme_colors['text_color'])]
+                template=theme['template_name'],
+                title_text="🍩 Sentiment Distribution (Donut Chart)",
+                annotations=[dict(text='Sentiment<br>Analysis', x=0.5, y=0.5, font_size=16, showarrow=False, font_color=theme['text_color'])]
             )
             
         elif plot_type == "line":
-            # For line plot, we'll show trend if there's a sequence
-            fig = px.line(
-                x=sentiment_counts.index,
-                y=sentiment_counts.values,
-                title="📈 Sentiment Trend Analysis",
-                markers=True
-            )
+            # Show the counts across the sentiment scale
+            fig = go.Figure(go.Scatter(
+                x=labels,
+                y=values,
+                mode='lines+markers',
+                line=dict(color="#4F46E5", width=3),
+                marker=dict(color="#7C3AED", size=8)
+            ))
             
             fig.update_layout(
-                template="plotly_dark" if dark_mode else "plotly",
-                plot_bgcolor=theme_colors['bg_color'],
-                paper_bgcolor=theme_colors['paper_bg'],
-                font_color=theme_colors['text_color'],
-                title_font_size=20,
-                title_x=0.5,
-                title_font_family="Inter, sans-serif",
-                margin=dict(t=80, b=60, l=60, r=60),
-                xaxis=dict(
-                    showgrid=False,
-                    linecolor=theme_colors['line_color'],
-                    color=theme_colors['text_color']
-                ),
-                yaxis=dict(
-                    showgrid=True,
-                    gridcolor=theme_colors['grid_color'],
-                    linecolor=theme_colors['line_color'],
-                    color=theme_colors['text_color']
-                )
-            )
-            
-            fig.update_traces(
-                line_color="#4F46E5",
-                line_width=3,
-                marker_color="#7C3AED",
-                marker_size=8
+                template=theme['template_name'],
+                title_text="📈 Sentiment Trend Analysis"
             )
         
         return fig
@@ -220,46 +280,27 @@ def create_confidence_chart(data, **kwargs):
         if data is None or data.empty or 'confidence' not in data.columns:
             return None
         
-        # Detect dark mode preference
-        dark_mode = detect_dark_mode()
-        theme_colors = get_theme_colors(dark_mode)
+        # Theme resolved once per rerun
+        theme = _current_theme()
         
-        # Create confidence distribution
-        fig = px.histogram(
-            data, 
-            x='confidence',
-            title="📊 Confidence Score Distribution",
-            labels={'confidence': 'Confidence Score', 'count': 'Number of Texts'},
-            nbins=20
-        )
+        # Create confidence distribution from precomputed bins
+        confidences = np.ascontiguousarray(data['confidence'].to_numpy(dtype=np.float32))
+        counts, edges = _confidence_histogram(confidences)
+        centers = (edges[:-1] + edges[1:]) * 0.5
+        fig = go.Figure(go.Bar(
+            x=centers,
+            y=counts,
+            width=edges[1] - edges[0],
+            marker_color="#4F46E5"
+        ))
         
         fig.update_layout(
-            template="plotly_dark" if dark_mode else "plotly",
-            plot_bgcolor=theme_colors['bg_color'],
-            paper_bgcolor=theme_colors['paper_bg'],
-            font_color=theme_colors['text_color'],
-            title_font_size=20,
-            title_x=0.5,
-            title_font_family="Inter, sans-serif",
-            margin=dict(t=80, b=60, l=60, r=60),
-            xaxis=dict(
-                showgrid=False,
-                linecolor=theme_colors['line_color'],
-                title_font_size=14,
-                title_font_family="Inter, sans-serif"
-            ),
-            yaxis=dict(
-                showgrid=True,
-                gridcolor=theme_colors['grid_color'],
-                linecolor=theme_colors['line_color'],
-                title_font_size=14,
-                title_font_family="Inter, sans-serif",
-                color=theme_colors['text_color']
-            )
+            template=theme['template_name'],
+            title_text="📊 Confidence Score Distribution",
+            xaxis_title="Confidence Score",
+            yaxis_title="Number of Texts"
         )
         
-        fig.update_traces(marker_color="#4F46E5")
-        
         return fig
         
     except Exception as e:
@@ -282,46 +323,169 @@ def create_keyword_importance(data, **kwargs):
         print(f"Error creating keyword importance chart: {str(e)}")
         return None
 
+# One WordCloud per theme, created on first use and reused for every render.
+# generate_from_frequencies stores the layout on the instance, so renders hold the lock.
+_WORDCLOUDS = {}
+_WORDCLOUD_LOCK = threading.Lock()
+
+def _get_wordcloud(dark_mode):
+    """Shared WordCloud instance for the given theme (call with _WORDCLOUD_LOCK held)."""
+    if dark_mode not in _WORDCLOUDS:
+        # Create a word cloud with dark mode support
+        # (sized to the 500x200 PDF embed rather than oversampling)
+        _WORDCLOUDS[dark_mode] = WordCloud(
+            width=800,
+            height=400,
+            background_color='#1f2937' if dark_mode else 'white',
+            max_words=100,
+            colormap='plasma' if dark_mode else 'viridis',
+            prefer_horizontal=0.7,
+            collocations=False,
+            color_func=lambda *args, **kwargs: "#f8fafc" if dark_mode else None
+        )
+    return _WORDCLOUDS[dark_mode]
+
+def _hash_texts(texts):
+    """Cheap content hash of a list of texts for the word cloud cache key."""
+    payload = b'\x00'.join(str(text).encode() for text in texts)
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh64(payload).intdigest()
+    return hashlib.blake2b(payload, digest_size=8).digest()
+
+def _fold_word_counts(counts):
+    """
+    Merge case variants and simple plurals, like WordCloud's process_tokens.
+    
+    Each word is reported in its most common spelling; a word ending in "s"
+    (but not "ss") is folded into its singular when that also occurs.
+    """
+    cases = defaultdict(Counter)
+    for word, count in counts.items():
+        cases[word.lower()][word] += count
+    for key in list(cases):
+        singular = key[:-1]
+        if key.endswith('s') and not key.endswith('ss') and singular in cases:
+            for word, count in cases.pop(key).items():
+                cases[singular][word[:-1]] += count
+    return {
+        case_counts.most_common(1)[0][0]: sum(case_counts.values())
+        for case_counts in cases.values()
+    }
+
+@st.cache_data(show_spinner=False, max_entries=8, hash_funcs={list: _hash_texts})
+def _render_wordcloud_png(texts, dark_mode):
+    """Render the word cloud for a list of texts to PNG bytes, memoized across reruns."""
+    # Count words text by text with the precompiled tokenizer instead of WordCloud's own
+    # pipeline, so no joined copy of the whole corpus is ever built
+    tokens = Counter()
+    for text in texts:
+        tokens.update(_WORD_RE.findall(str(text)))
+    
+    # Same clean-up as WordCloud.process_text, applied once per distinct token
+    counts = Counter()
+    for word, count in tokens.items():
+        if word.lower().endswith("'s"):
+            word = word[:-2]
+        if word.isdigit() or word.lower() in _STOPWORDS_LOWER:
+            continue
+        counts[word] += count
+    frequencies = _fold_word_counts(counts)
+    
+    # Lay out and rasterize on the shared per-theme instance; layout state lives on it
+    with _WORDCLOUD_LOCK:
+        image = _get_wordcloud(dark_mode).generate_from_frequencies(frequencies).to_image()
+    
+    # Encode the rendered bitmap directly with Pillow instead of re-rasterizing it through matplotlib
+    buf = BytesIO()
+    # Fast zlib level: the PNG is consumed immediately, so encode time matters more than size
+    image.save(buf, format='PNG', optimize=False, compress_level=1)
+    return buf.getvalue()
+
 def generate_wordcloud(texts, sentiments=None):
     """
     Generate a word cloud from texts with dark mode support.
+    
+    The PNG bytes are cached per text content and theme; a fresh buffer is
+    returned on every call since buffers cannot be shared across reruns.
     """
     if isinstance(texts, str):
         texts = [texts]
     
-    # Combine all texts
-    text = ' '.join(texts)
+    # Theme resolved once per rerun
+    dark_mode = _current_theme()['dark_mode']
     
-    # Detect dark mode for appropriate styling
-    dark_mode = detect_dark_mode()
+    return BytesIO(_render_wordcloud_png(list(texts), dark_mode))
+
+# Bright, PDF-friendly colors that show up clearly on white paper
+_PDF_COLORS = {
+    'Very Positive': '#00CC00',    # Bright Green
+    'Positive': '#66FF66',         # Light Green
+    'Neutral': '#FFD700',          # Gold/Yellow
+    'Negative': '#FF6600',         # Orange
+    'Very Negative': '#FF0000'     # Bright Red
+}
+
+# PDF colors indexed by sentiment category code; code -1 (unknown label) takes the trailing gray
+_PDF_CODE_TO_COLOR = np.array(list(_PDF_COLORS.values()) + ['#808080'])
+
+# PDF layout, registered below as the "dashboard_pdf" template
+_PDF_LAYOUT_BASE = dict(
+    # White background for better PDF rendering
+    plot_bgcolor="white",
+    paper_bgcolor="white",
     
-    # Create and generate a word cloud image with dark mode support
-    wordcloud = WordCloud(
-        width=1200,
-        height=600,
-        background_color='#1f2937' if dark_mode else 'white',
-        max_words=100,
-        colormap='plasma' if dark_mode else 'viridis',
-        prefer_horizontal=0.7,
-        collocations=False,
-        color_func=lambda *args, **kwargs: "#f8fafc" if dark_mode else None
-    ).generate(text)
+    # Better font settings for PDF
+    font=dict(
+        family="Arial, sans-serif",
+        size=14,
+        color="#000000"  # Black text for better PDF contrast
+    ),
     
-    # Display the word cloud
-    plt.figure(figsize=(12, 6))
-    plt.imshow(wordcloud, interpolation='bilinear')
-    plt.axis('off')
-    plt.tight_layout(pad=0)
+    # Adjust title for PDF
+    title=dict(
+        font=dict(size=18, color="#000000", family="Arial"),
+        x=0.5,
+        y=0.95
+    ),
     
-    # Set figure background to match theme
-    fig_bg = '#1f2937' if dark_mode else 'white'
+    # Better margins for PDF
+    margin=dict(t=70, b=50, l=50, r=50),
     
-    # Save to BytesIO
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight', dpi=300, 
-                facecolor=fig_bg, edgecolor='none')
-    plt.close()
-    return buf
+    # Force bright colors for PDF
+    colorway=list(_PDF_COLORS.values())
+)
+
+def _build_pdf_template():
+    """Build the print layout on top of Plotly's light template."""
+    template = go.layout.Template(pio.templates["plotly"])
+    template.layout.update(_PDF_LAYOUT_BASE)
+    return template
+
+# Registered once; PDF figures switch to it by name instead of restyling every field
+pio.templates["dashboard_pdf"] = _build_pdf_template()
+
+# Pie-only layout additions on top of the PDF template
+_PDF_PIE_LAYOUT = dict(
+    showlegend=True,
+    legend=dict(
+        orientation="v",
+        yanchor="middle",
+        y=0.5,
+        xanchor="left",
+        x=1.02,
+        font=dict(size=12, color="#000000"),
+        bgcolor="rgba(255,255,255,0.8)",
+        bordercolor="#000000",
+        borderwidth=1
+    )
+)
+
+_PDF_PIE_TRACE_STYLE = dict(
+    textfont=dict(size=14, color="#000000", family="Arial"),  # Black text
+    textposition='inside',
+    textinfo='percent+label',
+    insidetextorientation='radial'
+)
 
 def optimize_chart_for_pdf(fig):
     """Optimize a plotly figure for PDF export with enhanced styling and forced bright colors"""
@@ -329,81 +493,26 @@ def optimize_chart_for_pdf(fig):
         if fig is None:
             return None
         
-        # Create a copy of the figure for modification
-        pdf_fig = fig
-        
-        # Define bright, PDF-friendly colors that will show up clearly
-        pdf_colors = {
-            'Very Positive': '#00CC00',    # Bright Green
-            'Positive': '#66FF66',         # Light Green
-            'Neutral': '#FFD700',          # Gold/Yellow
-            'Negative': '#FF6600',         # Orange
-            'Very Negative': '#FF0000'     # Bright Red
-        }
+        # Restyle a copy so the on-screen (possibly cached) figure is left untouched
+        pdf_fig = go.Figure(fig)
         
-        # Enhance for PDF export
-        pdf_fig.update_layout(
-            # White background for better PDF rendering
-            plot_bgcolor="white",
-            paper_bgcolor="white",
-            
-            # Better font settings for PDF
-            font=dict(
-                family="Arial, sans-serif",
-                size=14,
-                color="#000000"  # Black text for better PDF contrast
-            ),
-            
-            # Adjust title for PDF
-            title=dict(
-                font=dict(size=18, color="#000000", family="Arial"),
-                x=0.5,
-                y=0.95
-            ),
-            
-            # Better margins for PDF
-            margin=dict(t=70, b=50, l=50, r=50),
-            
-            # Force bright colors for PDF
-            colorway=['#00CC00', '#66FF66', '#FFD700', '#FF6600', '#FF0000']
-        )
+        # For pie charts, enhance text contrast and force bright colors per segment
+        is_pie = len(pdf_fig.data) > 0 and isinstance(pdf_fig.data[0], go.Pie)
+        if is_pie:
+            labels = pdf_fig.data[0].labels
+            label_codes = pd.Categorical(
+                np.asarray(labels if labels is not None else [], dtype=object).astype(str),
+                categories=list(_PDF_COLORS)
+            ).codes
+            pdf_fig.update_traces(
+                marker=dict(
+                    colors=np.take(_PDF_CODE_TO_COLOR, label_codes),
+                    line=dict(color='#FFFFFF', width=3)  # White borders
+                ),
+                **_PDF_PIE_TRACE_STYLE
+            )
         
-        # For pie charts, enhance text contrast and force bright colors
-        if hasattr(pdf_fig, 'data') and len(pdf_fig.data) > 0:
-            trace = pdf_fig.data[0]
-            if hasattr(trace, 'type') and trace.type == 'pie':
-                # Force specific bright colors for pie chart segments
-                colors_list = []
-                if hasattr(trace, 'labels'):
-                    for label in trace.labels:
-                        colors_list.append(pdf_colors.get(str(label), '#808080'))
-                
-                pdf_fig.update_traces(
-                    marker=dict(
-                        colors=colors_list,
-                        line=dict(color='#FFFFFF', width=3)  # White borders
-                    ),
-                    textfont=dict(size=14, color="#000000", family="Arial"),  # Black text
-                    textposition='inside',
-                    textinfo='percent+label',
-                    insidetextorientation='radial'
-                )
-                
-                # Update layout specifically for pie charts
-                pdf_fig.update_layout(
-                    showlegend=True,
-                    legend=dict(
-                        orientation="v",
-                        yanchor="middle",
-                        y=0.5,
-                        xanchor="left",
-                        x=1.02,
-                        font=dict(size=12, color="#000000"),
-                        bgcolor="rgba(255,255,255,0.8)",
-                        bordercolor="#000000",
-                        borderwidth=1
-                    )
-                )
+        pdf_fig.update_layout(template="dashboard_pdf", **(_PDF_PIE_LAYOUT if is_pie else {}))
         
         return pdf_fig
         
@@ -411,27 +520,81 @@ def optimize_chart_for_pdf(fig):
         print(f"Error optimizing chart for PDF: {str(e)}")
         return fig  # Return original if optimization fails
 
-def convert_plotly_fig_to_bytes(fig):
-    """Convert a plotly figure to bytes buffer for PDF export with enhanced quality"""
+def _json_default(obj):
+    """Fallback for values orjson cannot serialize natively (object arrays, numpy scalars, ...)."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return str(obj)
+
+def _fast_fig_json(fig_dict):
+    """
+    Serialize an already-built figure dict to JSON bytes.
+    
+    Uses orjson when installed, skipping Plotly's validating encoder since the
+    traces were validated when the figure was constructed.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(fig_dict, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+    return pio.to_json(fig_dict, validate=False).encode()
+
+def _render_png(fig_dict, width, height, scale):
+    """
+    Rasterize a figure dict to PNG.
+    
+    plotly.io keeps a single Kaleido scope (one Chromium process, serialized
+    by its own lock) alive across calls, so repeated exports stay warm.
+    """
+    return pio.to_image(
+        fig_dict,
+        format="png",
+        validate=False,
+        width=width,
+        height=height,
+        scale=scale
+    )
+
+def convert_plotly_fig_to_bytes(fig, width=800, height=500, scale=2):
+    """
+    Convert a plotly figure to bytes buffer for PDF export with enhanced quality.
+    
+    Defaults are 800x500 (higher resolution, better aspect ratio) at 2x scale
+    (higher DPI for sharper images). PNGs are cached by figure spec and size.
+    """
     try:
         if fig is None:
             return None
         
-        # Create high-quality image with specific settings for PDF
-        img_bytes = fig.to_image(
-            format="png", 
-            engine="kaleido",
-            width=800,     # Higher resolution
-            height=500,    # Better aspect ratio
-            scale=2        # Higher DPI for sharper images
-        )
+        # Identical figure specs at the same size render to identical images, so reuse them
+        fig_dict = fig.to_dict()
+        spec_hash = hashlib.blake2b(_fast_fig_json(fig_dict), digest_size=16)
+        spec_hash.update(f"{width}x{height}@{scale}".encode())
+        spec_key = spec_hash.digest()
+        with _PNG_CACHE_LOCK:
+            img_bytes = _PNG_CACHE.get(spec_key)
+            if img_bytes is not None:
+                _PNG_CACHE.move_to_end(spec_key)
         
         if img_bytes is None:
-            return None
+            # Create high-quality image with specific settings for PDF
+            img_bytes = _render_png(fig_dict, width, height, scale)
+            
+            if img_bytes is None:
+                return None
+            
+            with _PNG_CACHE_LOCK:
+                _PNG_CACHE[spec_key] = img_bytes
+                if len(_PNG_CACHE) > PNG_CACHE_SIZE:
+                    _PNG_CACHE.popitem(last=False)
             
         buf = BytesIO(img_bytes)
         return buf
         
     except Exception as e:
         print(f"Error converting plotly figure to bytes: {str(e)}")
-        return None 
\ No newline at end of file
+        return None
+